@@ -1,18 +1,85 @@
+from django import forms
 from django.contrib import admin
-from api.models import Order, OrderItem, User
+from django.contrib.admin.widgets import AutocompleteSelect
+from api.models import Order, OrderItem, Product, User
+from api.search import get_search_backend
 
 # admin.py: Django admin paneli konfigurasyonu.
 # Neden: admin arayuzunde Order + OrderItem'lari rahat gormek.
+# Sayfalarin sorgu sayisi order'daki item sayisindan bagimsiz olmali (N+1 yok): __str__'lerin
+# okudugu iliskiler (Order.user, OrderItem.product) select_related ile ayni sorguda gelir.
+
+
+# Product admin: arama FTS index'i uzerinden (search.py); inline'daki product autocomplete'i de bunu kullanir.
+class ProductAdmin(admin.ModelAdmin):
+    list_display = ('name', 'price', 'stock', 'updated_at')
+    search_fields = ['name']  # FTS desteklenmeyen DB'de normal admin aramasi.
+
+    # Neden: admin aramasi "name LIKE '%..%'" ile her aramada tum tabloyu tarar.
+    def get_search_results(self, request, queryset, search_term):
+        backend = get_search_backend(queryset.model, queryset.db)
+        terms = search_term.split()
+        if backend is None or not terms:
+            return super().get_search_results(request, queryset, search_term)
+        return backend.search(queryset, terms), False
+
+
+# Product autocomplete widget'i: secili product'in etiketi icin satir basina sorgu atmak yerine
+# formun instance'indaki (inline queryset'inde select_related ile gelmis) product'i kullanir.
+# Deger degistiyse (orn. POST'ta baska product secildi) AutocompleteSelect gibi DB'den okur.
+class LoadedProductSelect(AutocompleteSelect):
+    product = None  # OrderItemForm doldurur.
+
+    def optgroups(self, name, value, attr=None):
+        selected = [str(v) for v in value if str(v) not in self.choices.field.empty_values]
+        if self.product is None or selected != [str(self.product.pk)]:
+            return super().optgroups(name, value, attr)
+        options = [] if self.is_required else [self.create_option(name, '', '', False, 0)]
+        label = self.choices.field.label_from_instance(self.product)
+        options.append(self.create_option(name, self.product.pk, label, True, len(options)))
+        return [(None, options, 0)]
+
+
+class OrderItemForm(forms.ModelForm):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        field = self.fields.get('product')
+        widget = getattr(field, 'widget', None)
+        widget = getattr(widget, 'widget', widget)  # RelatedFieldWidgetWrapper icindeki asil widget.
+        if isinstance(widget, LoadedProductSelect) and self.instance.product_id is not None:
+            widget.product = self.instance.product
+
 
 # Order icinde OrderItem'lari tablo halinde gosterir (inline).
 class OrderItemInline(admin.TabularInline):
     model = OrderItem  # Inline olarak gosterilecek model.
+    form = OrderItemForm
+    extra = 0  # Bos satir formu yok; "Add another" ile eklenir.
+    autocomplete_fields = ['product']  # Her satir icin tum katalogu <select> olarak basmak yerine arama.
+
+    # Satirlar product ile tek JOIN sorgusunda gelir (OrderItem.__str__ ve autocomplete etiketi icin).
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('product')
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'product':
+            kwargs['widget'] = LoadedProductSelect(db_field, self.admin_site, using=kwargs.get('using'))
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
 
 # Order admin: inline olarak order item'lari gormek icin.
 class OrderAdmin(admin.ModelAdmin):
+    list_display = ('order_id', 'user', 'status', 'created_at', 'total_price', 'item_count')
+    list_select_related = ('user',)  # Order.__str__ ve user kolonu icin satir basina sorgu yok.
+    list_filter = ('status',)
+    raw_id_fields = ('user',)  # Change formunda tum user'lari <select> olarak basmaz.
     inlines = [
         OrderItemInline
     ]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user')  # Change form basligi (__str__) icin.
+
 admin.site.register(Order, OrderAdmin)  # Order icin ozellestirilmis admin.
+admin.site.register(Product, ProductAdmin)
 admin.site.register(User)  # User modelini admin'e ekler.
@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    # Uygulama yuklenince signal handler'lari baglanir.
+    def ready(self):
+        from api import signals  # noqa: F401  @receiver handler'larini kaydeder.
+        from api.search import install_search_index_after_migrate
+        post_migrate.connect(install_search_index_after_migrate, sender=self)  # Product full-text index'i.
+        from api.metrics import install_query_counter
+        connection_created.connect(install_query_counter)  # /metrics sorgu sayilari (api/metrics.py).
@@ -0,0 +1,176 @@
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+from api.authentication import CachedJWTAuthentication
+from api.models import Order, Product
+from api.pagination import ProductInfoPagination
+from api.renderers import ORJSONRenderer
+from api.serializers import OrderSerializer, ProductInfoSerializer, ProductSerializer
+from api.views import OrderViewSet, ProductListCreateAPIView, with_order_items
+
+# async_views.py: ASGI altinda view kodu event loop'ta calisan okuma endpoint'leri.
+# Neden: uvicorn gibi ASGI sunucularda yavas istemciler worker thread'lerini bloklamasin;
+# tek process binlerce eszamanli istegi event loop uzerinde bekletebilsin.
+# DRF view'leri sync oldugu icin burada Django'nun async View'i + async ORM (aget, acount,
+# aaggregate, aiterator) kullanilir; filtreler ve serializer'lar sync view'lerle aynidir.
+# Serializer'lar sadece onceden cekilmis (prefetch edilmis) objelerle calisir, DB'ye gitmez.
+# URL'ler: /async/products/, /async/products/info, /async/products/<id>/, /async/orders/, /async/orders/<uuid>/
+# Thread'e gecisler: async ORM sorgulari Django'da hala sync_to_async ile calisir; Silk bu path'lere girmez
+# (SILK_PROFILING['ASYNC_PATHS']), api middleware'leri async calisir. Kalan tek middleware gecisi Django'nun
+# CsrfViewMiddleware.process_view'i (sync; ASGI altinda her istekte sync_to_async ile sarilir).
+
+
+# Ortak altyapi: async authentication, permission, filtreleme ve JSON render.
+class AsyncAPIView(View):
+    filter_backends = []
+    require_authentication = False  # True ise anonim istekler 401 alir (IsAuthenticated).
+    replica_reads = True  # Sadece okuma endpoint'leri; sorgular read replica'dan (api/db_router.py).
+    renderer = ORJSONRenderer()  # Sync view'lerin varsayilan renderer'i ile ayni cikti.
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.request = Request(request)  # query_params icin DRF Request sarmalayicisi (DB'ye gitmez).
+        try:
+            request.user = await self.authenticate(request)
+            if self.require_authentication and not request.user.is_authenticated:
+                raise exceptions.NotAuthenticated()
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            response = self.render(detail, status=exc.status_code)
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                response.status_code = 401
+                response['WWW-Authenticate'] = 'Bearer realm="api"'
+            return response
+
+    # JWT header'i varsa token imzasi sync (DB'siz) dogrulanir, user process ici cache'ten okunur;
+    # yoksa session user'i request.auser() ile async olarak yuklenir.
+    # Cache miss'te (user claim'i olmayan token'da ve CHECK_REVOKE_TOKEN acikken de) sync view'lerle ayni CachedJWTAuthentication.get_user
+    # calisir: InvalidToken -> 401, is_active ve revoke kontrolleri tek yerde kalir.
+    async def authenticate(self, request):
+        jwt = CachedJWTAuthentication()
+        header = jwt.get_header(request)
+        raw_token = jwt.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return await request.auser()
+        validated_token = jwt.get_validated_token(raw_token)
+        user = jwt.cached_user(validated_token)
+        if user is None:
+            user = await sync_to_async(jwt.get_user)(validated_token)
+        return user
+
+    # Filter backend'leri sadece QuerySet'i (lazy) degistirir; burada sorgu calismaz.
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    def render(self, data, status=200):
+        return HttpResponse(self.renderer.render(data), content_type=self.renderer.media_type, status=status)
+
+    def http_method_not_allowed(self, request, *args, **kwargs):
+        raise exceptions.MethodNotAllowed(request.method)
+
+
+# GET /async/products/: ProductListCreateAPIView ile ayni filtre/arama/siralama + limit/offset pagination.
+class AsyncProductListView(AsyncAPIView):
+    queryset = ProductListCreateAPIView.queryset
+    filterset_class = ProductListCreateAPIView.filterset_class
+    filter_backends = ProductListCreateAPIView.filter_backends
+    search_fields = ProductListCreateAPIView.search_fields
+    ordering_fields = ProductListCreateAPIView.ordering_fields
+    pagination_class = ProductListCreateAPIView.pagination_class
+    values_serializer = ProductListCreateAPIView.values_serializer
+
+    async def get(self, request):
+        queryset = self.filter_queryset(self.queryset.all())
+        paginator = self.pagination_class()
+        paginator.request = self.request
+        paginator.limit = paginator.get_limit(self.request)
+        paginator.offset = paginator.get_offset(self.request)
+        paginator.count = await queryset.acount()
+        rows = queryset.values_list(*self.values_serializer.sources)
+        if paginator.limit is not None:
+            rows = rows[paginator.offset:paginator.offset + paginator.limit]
+        rows = [row async for row in rows]
+        if self.request.query_params.get('shape') == 'columns':
+            results = self.values_serializer.to_columns(rows)
+        else:
+            results = self.values_serializer.to_representation(rows)
+        return self.render({
+            'count': paginator.count,
+            'next': paginator.get_next_link() if paginator.limit is not None else None,
+            'previous': paginator.get_previous_link() if paginator.limit is not None else None,
+            'results': results,
+        })
+
+
+# GET /async/products/<id>/
+class AsyncProductDetailView(AsyncAPIView):
+    async def get(self, request, product_id):
+        try:
+            product = await Product.objects.aget(pk=product_id)
+        except Product.DoesNotExist:
+            raise exceptions.NotFound()
+        return self.render(ProductSerializer(product).data)
+
+
+# GET /async/products/info: ProductInfoAPIView ile ayni response.
+class AsyncProductInfoView(AsyncAPIView):
+    pagination_class = ProductInfoPagination
+
+    async def get(self, request):
+        products = Product.objects.order_by('pk')
+        info = await products.aaggregate(count=Count('pk'), max_price=Max('price'))  # Tek sorgu: COUNT + MAX.
+        paginator = self.pagination_class()
+        paginator.request = self.request
+        paginator.count = info['count']
+        paginator.limit = paginator.get_limit(self.request)
+        paginator.offset = paginator.get_offset(self.request)
+        page = [product async for product in products[paginator.offset:paginator.offset + paginator.limit]]
+        return self.render(ProductInfoSerializer({
+            'products': page,
+            'count': info['count'],
+            'max_price': info['max_price'],
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+        }).data)
+
+
+# Order endpoint'leri: login zorunlu; staff tum order'lari, normal user sadece kendi order'larini gorur.
+class AsyncOrderMixin:
+    require_authentication = True
+    filterset_class = OrderViewSet.filterset_class
+    filter_backends = OrderViewSet.filter_backends
+    ordering_fields = OrderViewSet.ordering_fields
+    chunk_size = OrderViewSet.stream_chunk_size  # aiterator chunk'i; her chunk icin items prefetch calisir.
+
+    def get_queryset(self, request):
+        queryset = Order.objects.all()
+        if not request.user.is_staff:
+            queryset = queryset.filter(user=request.user)
+        return with_order_items(self.filter_queryset(queryset))
+
+
+# GET /async/orders/
+class AsyncOrderListView(AsyncOrderMixin, AsyncAPIView):
+    async def get(self, request):
+        serializer = OrderSerializer()
+        orders = [
+            serializer.to_representation(order)
+            async for order in self.get_queryset(request).aiterator(chunk_size=self.chunk_size)
+        ]
+        return self.render(orders)
+
+
+# GET /async/orders/<uuid>/
+class AsyncOrderDetailView(AsyncOrderMixin, AsyncAPIView):
+    async def get(self, request, order_id):
+        try:
+            order = await self.get_queryset(request).aget(pk=order_id)
+        except Order.DoesNotExist:
+            raise exceptions.NotFound()
+        return self.render(OrderSerializer(order).data)
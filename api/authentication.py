@@ -0,0 +1,79 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+# authentication.py: DRF authentication siniflari.
+# Neden: JWTAuthentication token imzasini dogruladiktan sonra her istekte api.User icin
+# SELECT atiyor; OrderViewSet gibi endpoint'ler sadece id ve is_staff'a bakiyor.
+
+
+# Process ici, TTL'li LRU cache: user_id -> User.
+# Neden: ayni kullanicinin ardisik isteklerinde DB'ye gitmemek. User kaydedilince/silinince
+# signals.py bu cache'i temizler; diger worker process'lerde en fazla TTL kadar eski veri kalabilir.
+class UserCache:
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._users = OrderedDict()  # str(user_id) -> (expires_at, user); sira = LRU sirasi.
+        self._lock = threading.Lock()
+
+    # Her cagri kopya dondurur; bir istekte request.user uzerinde yapilan degisiklik digerlerine sizmasin.
+    def get(self, user_id):
+        user_id = str(user_id)  # Token claim'i string, signal'daki pk int olabilir; key tek tipte tutulur.
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._users[user_id]
+                return None
+            self._users.move_to_end(user_id)
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        user_id = str(user_id)
+        with self._lock:
+            self._users[user_id] = (time.monotonic() + self.ttl, copy.copy(user))
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_size:
+                self._users.popitem(last=False)  # En uzun suredir kullanilmayan user'i at.
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+user_cache = UserCache(max_size=settings.API_USER_CACHE_SIZE, ttl=settings.API_USER_CACHE_TTL)
+
+
+# JWTAuthentication + user cache: token dogrulamasi aynen calisir, User satiri cache'ten gelir.
+# is_active ve revoke kontrolleri sadece cache miss'te (simplejwt'nin kendi get_user'inda) calisir.
+# Cache hit'te user en fazla API_USER_CACHE_TTL saniye eski olabilir: save()/delete() signals.py ile
+# bu process'te cache'i hemen temizler, ama QuerySet.update() ile deaktif edilen user (veya diger
+# worker'larda yapilan degisiklik) TTL dolana kadar kabul edilir.
+# SIMPLE_JWT['CHECK_REVOKE_TOKEN'] aciksa cache kullanilmaz; sifre degisince token'lar hemen gecersiz olmali.
+class CachedJWTAuthentication(JWTAuthentication):
+    # Cache'teki user; cache kapaliysa, token'da user claim'i yoksa veya miss'te None.
+    def cached_user(self, validated_token):
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            return None
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        return user_cache.get(user_id) if user_id is not None else None
+
+    def get_user(self, validated_token):
+        user = self.cached_user(validated_token)
+        if user is None:
+            user = super().get_user(validated_token)
+            if not jwt_settings.CHECK_REVOKE_TOKEN:
+                user_cache.set(validated_token[jwt_settings.USER_ID_CLAIM], user)
+        return user
@@ -0,0 +1,274 @@
+import random
+import statistics
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import OperationalError, connection, connections, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Order, Product, User
+from api.renderers import ORJSONRenderer
+from api.serializers import BulkOrderCreateSerializer, OrderSerializer, ProductSerializer
+from api.views import with_order_items
+
+# benchmarks.py: API endpoint'leri icin senaryolar ve performans butceleri.
+# Neden: N+1 gibi regresyonlari (orn. OrderSerializer'da prefetch'in kaybolmasi) otomatik yakalamak.
+# Hem `manage.py benchmark_api` (latency + bellek + JSON rapor) hem de tests.py (sorgu butceleri) kullanir.
+
+SILK_FREE_MIDDLEWARE = [m for m in settings.MIDDLEWARE if m != settings.SILKY_MIDDLEWARE_CLASS]  # Silk olcumleri bozar.
+
+
+# Tek bir endpoint cagrisi + butcesi.
+# max_queries: olcekten bagimsiz ust sinir (sorgu sayisi veri buyudukce artmamali).
+# max_p99_ms: None ise latency sadece kaydedilir (orn. pagination'siz /orders/ veriyle buyur).
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    path: str
+    params: dict = field(default_factory=dict)
+    user: str = 'anonymous'  # 'anonymous', 'staff' veya 'regular'.
+    max_queries: int = 0
+    max_p99_ms: float = None
+
+    def url(self, context):
+        return self.path.format(**context)
+
+
+PRODUCT_LIST_SCENARIOS = [
+    Scenario('products', '/products/', {}),
+    Scenario('products-name-icontains', '/products/', {'name__icontains': 'camera'}),
+    Scenario('products-name-iexact', '/products/', {'name__iexact': 'digital camera'}),
+    Scenario('products-price-lt', '/products/', {'price__lt': '100'}),
+    Scenario('products-price-range', '/products/', {'price__range': '100,350'}),
+    Scenario('products-search', '/products/', {'search': 'camera'}),
+    Scenario('products-ordering-name', '/products/', {'ordering': 'name'}),
+    Scenario('products-ordering-price', '/products/', {'ordering': '-price'}),
+    Scenario('products-ordering-stock', '/products/', {'ordering': 'stock'}),
+    Scenario('products-search-ordering', '/products/', {'search': 'camera', 'ordering': 'price', 'price__lt': '500'}),
+    Scenario('products-deep-offset', '/products/', {'limit': 20, 'offset': '{deep_offset}'}),
+    Scenario('products-cursor', '/products/', {'pagination': 'cursor', 'ordering': 'price', 'limit': 20}),
+    Scenario('products-large-page', '/products/', {'limit': 1000}),
+    Scenario('products-large-page-columns', '/products/', {'limit': 1000, 'shape': 'columns'}),
+]
+
+SCENARIOS = [
+    *(Scenario(s.name, s.path, s.params, max_queries=3, max_p99_ms=250) for s in PRODUCT_LIST_SCENARIOS),
+    Scenario('products-info', '/products/info', {}, max_queries=3, max_p99_ms=250),
+    Scenario('product-detail', '/products/{product_id}/', {}, max_queries=2, max_p99_ms=50),
+    Scenario('products-batch', '/products/batch', {'ids': '{batch_ids}'}, max_queries=2, max_p99_ms=50),
+    Scenario('orders-staff', '/orders/', {}, user='staff', max_queries=5),
+    Scenario('orders-regular', '/orders/', {}, user='regular', max_queries=5),
+    Scenario('orders-staff-status', '/orders/', {'status': 'Pending'}, user='staff', max_queries=5),
+    Scenario('order-detail', '/orders/{order_id}/', {}, user='regular', max_queries=5, max_p99_ms=50),
+    Scenario('analytics-sales', '/analytics/sales', {}, user='staff', max_queries=4, max_p99_ms=50),
+    Scenario('analytics-sales-product', '/analytics/sales', {'group': 'product'}, user='staff', max_queries=4, max_p99_ms=50),
+]
+
+
+# Olcek -> populate_db argumanlari.
+def seed_options(scale, seed=0):
+    return {
+        'products': scale,
+        'users': max(10, scale // 100),
+        'orders': scale,
+        'items_per_order': 3,
+        'batch_size': 5000,
+        'seed': seed,
+    }
+
+
+# Senaryolarin URL'lerinde kullanilan id'ler ve login olacak kullanicilar.
+def build_context():
+    regular = User.objects.filter(is_staff=False, order__isnull=False).order_by('pk').first()
+    return {
+        'product_id': Product.objects.order_by('pk').values_list('pk', flat=True).first(),
+        'batch_ids': ','.join(map(str, Product.objects.order_by('-pk').values_list('pk', flat=True)[:40])),  # 40 urunluk sepet.
+        'order_id': Order.objects.filter(user=regular).order_by('pk').values_list('pk', flat=True).first(),
+        'deep_offset': max(Product.objects.count() - 20, 0),
+        'users': {'staff': User.objects.get(username='admin'), 'regular': regular},
+    }
+
+
+def make_client(scenario, context):
+    client = Client()
+    if scenario.user != 'anonymous':
+        client.force_login(context['users'][scenario.user])
+    return client
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+# Tek istek: (status_code, sorgu sayisi). Response cache temizlenir; DB yolunu olcmek icin.
+def run_once(client, scenario, context, warm_cache=False):
+    if not warm_cache:
+        caches[settings.API_RESPONSE_CACHE_ALIAS].clear()
+    params = {key: str(value).format(**context) for key, value in scenario.params.items()}
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(scenario.url(context), params)
+        if response.streaming:
+            b''.join(response.streaming_content)
+    return response.status_code, len(queries)
+
+
+# Senaryoyu iterations kez calistirir; latency, sorgu sayisi ve tepe bellek kullanimini olcer.
+def measure(scenario, context, iterations=20, warm_cache=False):
+    client = make_client(scenario, context)
+    status_code, query_count = run_once(client, scenario, context, warm_cache)  # Isinma + sorgu sayisi.
+
+    timings = []
+    for _ in range(iterations):
+        if not warm_cache:
+            caches[settings.API_RESPONSE_CACHE_ALIAS].clear()
+        start = time.perf_counter()
+        client.get(scenario.url(context), {key: str(value).format(**context) for key, value in scenario.params.items()})
+        timings.append((time.perf_counter() - start) * 1000)
+        reset_queries()
+
+    tracemalloc.start()  # Bellek ayri bir calistirmada olculur; tracemalloc latency'yi bozar.
+    run_once(client, scenario, context, warm_cache)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = {
+        'scenario': scenario.name,
+        'status': status_code,
+        'queries': query_count,
+        'p50_ms': round(statistics.median(timings), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'peak_kb': round(peak / 1024, 1),
+        'budget': {'max_queries': scenario.max_queries, 'max_p99_ms': scenario.max_p99_ms},
+    }
+    result['violations'] = budget_violations(result)
+    return result
+
+
+def budget_violations(result):
+    violations = []
+    budget = result['budget']
+    if result['status'] != 200:
+        violations.append(f'status {result["status"]}')
+    if result['queries'] > budget['max_queries']:
+        violations.append(f'{result["queries"]} queries > {budget["max_queries"]}')
+    if budget['max_p99_ms'] is not None and result['p99_ms'] > budget['max_p99_ms']:
+        violations.append(f'p99 {result["p99_ms"]}ms > {budget["max_p99_ms"]}ms')
+    return violations
+
+
+# Renderer karsilastirmasi icin payload'lar: endpoint'lerin urettigi serializer ciktilari ve
+# serializer'siz (ham Decimal/UUID/datetime iceren) values() satirlari.
+def renderer_payloads(limit):
+    orders = Order.objects.order_by('pk')
+    return {
+        'products': ProductSerializer(Product.objects.order_by('pk')[:limit], many=True).data,
+        'orders': OrderSerializer(with_order_items(orders)[:limit], many=True).data,
+        'orders-values': list(orders.values('order_id', 'created_at', 'status', 'total_price')[:limit]),
+    }
+
+
+# Ayni payload'i iki renderer ile render eder; ciktilarin ayni olup olmadigini ve sureleri dondurur.
+def compare_renderers(name, payload, iterations=20, baseline=None, candidate=None):
+    baseline = baseline or JSONRenderer()
+    candidate = candidate or ORJSONRenderer()
+    timings = {}
+    for label, renderer in (('baseline', baseline), ('candidate', candidate)):
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            renderer.render(payload)
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[label] = statistics.median(samples)
+    expected = baseline.render(payload)
+    return {
+        'payload': name,
+        'bytes': len(expected),
+        'identical': candidate.render(payload) == expected,
+        'baseline_ms': round(timings['baseline'], 3),
+        'candidate_ms': round(timings['candidate'], 3),
+        'speedup': round(timings['baseline'] / max(timings['candidate'], 1e-6), 2),
+    }
+
+
+# Varsayilan DB'yi gecici olarak baska bir SQLite dosyasina ve OPTIONS'a yonlendirir.
+# Thread'ler kendi baglantilarini ayni settings dict'inden acar; bu yuzden dict yerinde degistirilir.
+@contextmanager
+def sqlite_database(path, options):
+    config = connections.settings['default']
+    saved = {key: config[key] for key in ('NAME', 'OPTIONS')}
+    connection.close()
+    config.update(NAME=str(path), OPTIONS=options)
+    try:
+        yield
+    finally:
+        connection.close()
+        config.update(saved)
+
+
+# Eszamanli product/order is yuku: okuyucular product sayfasi + order detayi serialize eder,
+# yazicilar /orders/bulk/ ile ayni yoldan (BulkOrderCreateSerializer) order olusturur.
+# Her thread duration saniye boyunca calisir; "database is locked" gibi OperationalError'lar sayilir.
+def sqlite_workload(duration=5.0, readers=4, writers=2, seed=0):
+    user = User.objects.get(username='admin')
+    Product.objects.update(stock=10 ** 9)  # Yazicilar stok yuzunden ValidationError almasin.
+    product_ids = list(Product.objects.values_list('pk', flat=True))
+    order_ids = list(Order.objects.values_list('pk', flat=True)[:1000])
+    timings = {'read': [], 'write': []}
+    errors = {'read': 0, 'write': 0}
+    lock = threading.Lock()
+
+    def read(rng):
+        offset = rng.randrange(max(len(product_ids) - 50, 1))
+        ProductSerializer(Product.objects.order_by('pk')[offset:offset + 50], many=True).data
+        OrderSerializer(with_order_items(Order.objects.filter(pk=rng.choice(order_ids))), many=True).data
+
+    def write(rng):
+        items = [{'product': pk, 'quantity': 1} for pk in rng.sample(product_ids, 3)]
+        serializer = BulkOrderCreateSerializer(data={'orders': [{'items': items}]}, context={'request': SimpleNamespace(user=user)})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    def worker(kind, index, deadline):
+        rng = random.Random(seed * 1000 + index)
+        operation = read if kind == 'read' else write
+        samples, failed = [], 0
+        try:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    operation(rng)
+                except OperationalError:
+                    failed += 1
+                    continue
+                samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            connection.close()  # Thread'in kendi baglantisi.
+        with lock:
+            timings[kind] += samples
+            errors[kind] += failed
+
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=worker, args=('read', i, deadline)) for i in range(readers)]
+    threads += [threading.Thread(target=worker, args=('write', readers + i, deadline)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    result = {}
+    for kind in ('read', 'write'):
+        samples = timings[kind]
+        result[f'{kind}s_per_s'] = round(len(samples) / duration, 1)
+        result[f'{kind}_p50_ms'] = round(statistics.median(samples), 3) if samples else None
+        result[f'{kind}_p99_ms'] = round(percentile(samples, 0.99), 3) if samples else None
+        result[f'{kind}_errors'] = errors[kind]
+    return result
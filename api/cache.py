@@ -0,0 +1,131 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.conditional import not_modified_response, set_validators
+
+# cache.py: GET response'lari icin versiyonlu cache katmani.
+# Neden: okuma trafigi yazmadan cok fazla; ayni query string'e her seferinde
+# queryset + filter + serializer calistirmak yerine hazir response verisini donmek.
+# Invalidation: her model icin bir versiyon sayaci tutulur ve cache key'in parcasidir.
+# Model yazildiginda sayac artar, eski key'ler bir daha okunmaz (LRU ile zamanla silinir).
+
+
+def response_cache():
+    return caches[settings.API_RESPONSE_CACHE_ALIAS]
+
+
+def version_key(model):
+    return f'api:version:{model._meta.label_lower}'
+
+
+# Versiyon key'i cache'den dusmusse (LRU) zaman bazli yeni bir deger ile baslatilir.
+# Neden: sayac 1'e geri donerse eski versiyonla yazilmis response'lar tekrar gecerli olurdu.
+def get_version(model):
+    cache = response_cache()
+    version = cache.get(version_key(model))
+    if version is None:
+        cache.add(version_key(model), time.time_ns(), timeout=None)
+        version = cache.get(version_key(model))
+    return version
+
+
+def modified_key(model):
+    return f'api:modified:{model._meta.label_lower}'
+
+
+# Modelin son yazim zamani (her bump_version'da guncellenir); liste response'larinin Last-Modified'i.
+# Neden: Max(updated_at) silinen (veya filtreden cikan) kayitlarda geri gitmez / ilerlemez; 304 eski listeyi onaylardi.
+# Key cache'den dusmusse simdiki zamanla baslatilir: istemciler bir kez tam response alir, eski veri 304 ile donmez.
+def get_modified(model):
+    cache = response_cache()
+    timestamp = cache.get(modified_key(model))
+    if timestamp is None:
+        cache.add(modified_key(model), time.time(), timeout=None)
+        timestamp = cache.get(modified_key(model))
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def _incr_version(model):
+    cache = response_cache()
+    try:
+        cache.incr(version_key(model))
+    except ValueError:  # Key yoksa incr hata verir.
+        get_version(model)
+    cache.set(modified_key(model), time.time(), timeout=None)
+
+
+# Model yazildiginda cagrilir (signals.py, populate_db, bulk islemler); versiyonla birlikte son yazim zamani da ilerler.
+# Commit'ten once ve sonra iki kez artirilir: commit'ten once baska bir istek eski veriyi
+# yeni versiyonla cache'e yazmis olabilir; commit sonrasi artis onu da gecersiz kilar.
+def bump_version(model):
+    _incr_version(model)
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _incr_version(model))
+
+
+# GET response'unu (view, host, path, normalize edilmis query string, model versiyonlari) ile cache'ler.
+# ETag = cache key'in hash'i; If-None-Match eslesirse DB'ye hic gitmeden 304 doner.
+# Last-Modified view'in get_last_modified() hook'undan gelir (varsayilan: cache_models'in son yazim zamani,
+# DB'ye gitmez) ve response ile birlikte cache'lenir; cache miss'te If-Modified-Since karari serializer'dan once verilir.
+# Sadece JSON renderer icin calisir (browsable API kullaniciya gore degisir).
+class CachedResponseMixin:
+    cache_models = ()  # Response'u etkileyen modeller; versiyonlari key'e eklenir.
+    cache_timeout = None  # None ise cache backend'in TIMEOUT degeri kullanilir.
+
+    def get(self, request, *args, **kwargs):
+        return self.cached_get(request, super().get, *args, **kwargs)
+
+    # handler: response'u ureten asil GET fonksiyonu; get()'i kendisi tanimlayan view'ler bunu dogrudan cagirir.
+    def cached_get(self, request, handler, *args, **kwargs):
+        if request.accepted_renderer.format != 'json':
+            return handler(request, *args, **kwargs)
+
+        key = self.get_cache_key(request, kwargs)
+        etag = f'"{key.rsplit(":", 1)[1]}"'
+        if 'If-None-Match' in request.headers:
+            response = not_modified_response(request, etag=etag)
+            if response is not None:
+                return response
+
+        cache = response_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            data, last_modified = cached
+        else:
+            last_modified = self.get_last_modified(request, *args, **kwargs)
+            response = not_modified_response(request, etag=etag, last_modified=last_modified)
+            if response is not None:
+                return response
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = response.data
+            cache.set(key, (data, last_modified), **({} if self.cache_timeout is None else {'timeout': self.cache_timeout}))
+
+        response = not_modified_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            return response
+        return set_validators(Response(data), etag, last_modified)
+
+    # Response'un Last-Modified degeri; None ise sadece ETag kullanilir.
+    # Varsayilan: cache_models'in en son yazim zamani (silmeler dahil, versiyon sayaci ile ayni anda ilerler).
+    def get_last_modified(self, request, *args, **kwargs):
+        if not self.cache_models:
+            return None
+        return max(get_modified(model) for model in self.cache_models)
+
+    # Query param'lar isme gore siralanir: ?offset=2&limit=2 ile ?limit=2&offset=2 ayni key'i kullanir.
+    def get_cache_key(self, request, kwargs):
+        versions = ','.join(str(get_version(model)) for model in self.cache_models)
+        params = '&'.join(f'{name}={value}' for name, values in sorted(request.query_params.lists()) for value in values)
+        url_kwargs = ','.join(f'{name}={value}' for name, value in sorted(kwargs.items()))
+        raw = f'{type(self).__name__}|{versions}|{request.get_host()}|{request.path}|{url_kwargs}|{params}'
+        return f'api:response:{hashlib.md5(raw.encode("utf-8")).hexdigest()}'
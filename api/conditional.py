@@ -0,0 +1,91 @@
+import hashlib
+import time
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+
+# conditional.py: Conditional GET (ETag / Last-Modified) yardimcilari.
+# Neden: polling yapan istemciler degismeyen veri icin her seferinde tum body'yi indirmesin;
+# 304 karari tek bir hafif sorgu (updated_at) ile verilir, serializer hic calismaz.
+
+
+# QuerySet'teki en son updated_at; bos ise None.
+def last_modified_of(queryset):
+    return queryset.order_by().aggregate(last_modified=Max('updated_at'))['last_modified']
+
+
+# Liste icin (ETag, Last-Modified). ETag: adet + en son updated_at tek aggregate sorgusunda (adet silinen,
+# updated_at eklenen/guncellenen kayitlari yakalar). Last-Modified: modelin son yazim zamani (cache.get_modified);
+# Max(updated_at) silinen veya filtreden cikan kayitlarda ilerlemedigi icin If-Modified-Since'e eski liste 304 alirdi.
+def list_validators(queryset, request):
+    from api.cache import get_modified  # cache.py bu modulu import eder.
+
+    values = queryset.order_by().aggregate(count=Count('pk'), last_modified=Max('updated_at'))
+    newest = values['last_modified']
+    token = f'{values["count"]}|{newest.timestamp() if newest else ""}|{request.get_full_path()}'
+    return f'"{hashlib.md5(token.encode("utf-8")).hexdigest()}"', get_modified(queryset.model)
+
+
+# Tek kayit icin (ETag, Last-Modified); kayit yoksa (None, None) -> normal 404 akisi calisir.
+def object_validators(queryset):
+    last_modified = queryset.order_by().values_list('updated_at', flat=True).first()
+    if last_modified is None:
+        return None, None
+    return f'"{last_modified.timestamp():.6f}"', last_modified
+
+
+# Last-Modified'in saniye cinsinden degeri; degisiklik icinde bulunulan saniyedeyse None.
+# Neden: HTTP tarihi saniye hassasiyetinde; ayni saniye icinde sonradan yapilan bir yazim ayni Last-Modified'i
+# uretir ve If-Modified-Since ile 304 alirdi. O saniye gecene kadar sadece ETag kullanilir.
+def settled_timestamp(last_modified):
+    if last_modified is None:
+        return None
+    timestamp = int(last_modified.timestamp())
+    return timestamp if timestamp < int(time.time()) else None
+
+
+# If-None-Match / If-Modified-Since eslesirse 304 response'u, degilse None doner.
+def not_modified_response(request, etag=None, last_modified=None):
+    return get_conditional_response(request, etag=etag, last_modified=settled_timestamp(last_modified))
+
+
+def set_validators(response, etag=None, last_modified=None):
+    if response.status_code != status.HTTP_200_OK:
+        return response
+    if etag:
+        response['ETag'] = etag
+    timestamp = settled_timestamp(last_modified)
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    return response
+
+
+# ViewSet'lerin list/retrieve aksiyonlarina conditional GET ekler.
+# get_conditional_queryset(): annotate/prefetch icermeyen, sadece gorunurluk filtresi uygulanmis QuerySet.
+class ConditionalGetMixin:
+    def get_conditional_queryset(self):
+        return self.get_queryset()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_conditional_queryset())
+        etag, last_modified = list_validators(queryset, request)
+        return self.conditional(request, etag, last_modified, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_conditional_queryset())
+        try:
+            etag, last_modified = object_validators(queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]}))
+        except (TypeError, ValueError, ValidationError):  # Gecersiz id (orn. bozuk UUID): normal 404 akisi.
+            etag, last_modified = None, None
+        return self.conditional(request, etag, last_modified, super().retrieve, *args, **kwargs)
+
+    def conditional(self, request, etag, last_modified, handler, *args, **kwargs):
+        if etag is not None:
+            response = not_modified_response(request, etag, last_modified)
+            if response is not None:
+                return response
+        return set_validators(handler(request, *args, **kwargs), etag, last_modified)
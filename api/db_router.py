@@ -0,0 +1,118 @@
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+# db_router.py: okumalari read replica'lara, yazmalari primary'ye yonlendiren database router (settings.py).
+# Neden: urun/order GET trafigi primary'yi yormasin; replica'lar settings.DATABASE_REPLICAS'ta listelenir.
+# Replica'ya sadece replica_reads = True olan view'lerin GET/HEAD istekleri gider (ReplicaRoutingMiddleware);
+# management command, shell, signal ve yazma istekleri her zaman primary kullanir.
+# Sticky reads: bir istek api modellerine yazarsa response'a kisa omurlu bir cookie eklenir; cookie
+# suresince (DATABASE_STICKY_SECONDS, replica gecikmesinden uzun olmali) o istemcinin okumalari da
+# primary'den yapilir. Ayni istek icinde yazmadan sonraki okumalar da primary'ye doner.
+
+STICKY_COOKIE = 'db_primary'
+_routing = ContextVar('db_routing', default=None)
+
+
+UNDECIDED = object()
+
+
+# Istek basina yonlendirme durumu.
+# Replica, view resolve edildikten sonraki ilk okumada secilir (process_view yok): ASGI altinda sync
+# process_view Django tarafindan sync_to_async ile sarilir ve her istekte thread'e gecis demektir.
+class RoutingState:
+    __slots__ = ('request', 'replica', 'wrote')
+
+    def __init__(self, request):
+        self.request = request
+        self.replica = UNDECIDED  # Istek icin secilen replica alias'i; None ise primary.
+        self.wrote = False
+
+    def read_alias(self):
+        if self.replica is UNDECIDED:
+            match = self.request.resolver_match
+            if match is None:  # View henuz resolve edilmedi (orn. middleware'lerin okumalari): primary.
+                return None
+            self.replica = choose_replica(self.request, match)
+        return self.replica
+
+
+# GET/HEAD isteklerinde replica_reads = True olan view'ler icin rastgele bir replica (istek boyunca ayni);
+# sticky cookie varsa veya replica tanimli degilse None (primary).
+def choose_replica(request, match):
+    replicas = settings.DATABASE_REPLICAS
+    view_class = getattr(match.func, 'view_class', getattr(match.func, 'cls', None))
+    if (
+        replicas
+        and request.method in ('GET', 'HEAD')
+        and getattr(view_class, 'replica_reads', False)
+        and STICKY_COOKIE not in request.COOKIES
+    ):
+        return random.choice(replicas)
+    return None
+
+
+def routes_to_replica(model):
+    return model._meta.app_label == 'api'  # Session, silk vb. tablolari gecikmeye duyarli; primary'de kalir.
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is not None and routes_to_replica(model):
+            return state.read_alias()
+        return None  # None -> 'default' (primary).
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None and routes_to_replica(model):
+            state.replica = None  # Yazmadan sonraki okumalar primary'den (replica henuz yakalamamis olabilir).
+            state.wrote = True
+        return None
+
+    # Replica'lar primary'nin kopyasi; iliskiler her zaman gecerli.
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    # Migration sadece primary'de calisir; replica'lar (TEST MIRROR) replikasyonla gelir.
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return not settings.DATABASES[db].get('TEST', {}).get('MIRROR')
+
+
+# Istek boyunca yonlendirme durumunu (contextvar) tutar; yazma olursa sticky cookie ekler.
+# Sync ve async calisabilir: async view'lerin async ORM sorgulari sync_to_async thread'inde ayni context'i gorur.
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState(request)
+        token = _routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self.finish(state, response)
+
+    async def __acall__(self, request):
+        state = RoutingState(request)
+        token = _routing.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self.finish(state, response)
+
+    def finish(self, state, response):
+        if state.wrote:
+            response.set_cookie(STICKY_COOKIE, '1', max_age=settings.DATABASE_STICKY_SECONDS, httponly=True, samesite='Lax')
+        return response
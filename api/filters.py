@@ -1,5 +1,7 @@
 import django_filters
-from api.models import Product, Order
+from django.db.models import Value
+from django.db.models.functions import Upper
+from api.models import Product, Order, created_on_days
 from rest_framework import filters
 
 # filters.py: django-filters ve custom filter backend'ler burada.
@@ -16,6 +18,13 @@ class InStockFilterBackend(filters.BaseFilterBackend):
 
 # Product icin query param filtreleri (django-filter).
 class ProductFilter(django_filters.FilterSet):
+    name__iexact = django_filters.CharFilter(method='filter_name_iexact')
+
+    # name__iexact: UPPER(name) = UPPER(deger); Product'taki Upper(name) index'i kullanilir.
+    # Neden: SQLite'ta iexact "LIKE" sorgusuna donusur ve index kullanamaz; PostgreSQL zaten UPPER() karsilastirir.
+    def filter_name_iexact(self, queryset, name, value):
+        return queryset.alias(name_upper=Upper('name')).filter(name_upper=Upper(Value(value)))
+
     class Meta:
         model = Product  # Bu filter hangi modele ait.
         fields = {
@@ -32,10 +41,28 @@ class ProductFilter(django_filters.FilterSet):
 
 # Order icin query param filtreleri (django-filter).
 class OrderFilter(django_filters.FilterSet):
-    created_at = django_filters.DateFilter(field_name='created_at__date')  # DateField'e cevirir; sadece tarih bazli filtre icin.
+    created_at = django_filters.DateFilter(method='filter_created_on')  # created_at=2026-02-01: o gunun order'lari.
+
+    # created_at__date yerine gun araligi (created_at >= gun AND created_at < ertesi gun).
+    # Neden: DATE(created_at) = .. her satirda fonksiyon calistirir ve created_at index'lerini kullanamaz.
+    def filter_created_on(self, queryset, name, value):
+        return queryset.filter(created_on_days([value]))
+
     class Meta:
         model = Order  # Bu filter hangi modele ait.
         fields = {
             'status': ['exact'],  # status=Pending gibi.
-            'created_at': ['lt', 'gt', 'exact']  # created_at__lt=2026-02-01 gibi.
+            'created_at': ['lt', 'gt', 'exact'],  # created_at__lt=2026-02-01 gibi.
+            'total_price': ['lt', 'gt'],  # total_price__gt=100; Order.total_price index'li kolon.
             }
+
+
+# /analytics/sales filtreleri; OrderFilter ile ayni isimler, rollup tablolarinin day kolonuna uygulanir.
+# Model'e bagli degil: view DailySales veya DailyProductSales queryset'i verir.
+# Not: rollup'lar gun cozunurlugunde; created_at__gt=2026-02-01 Subat 1'i dahil etmez.
+class SalesFilter(django_filters.FilterSet):
+    status = django_filters.ChoiceFilter(choices=Order.StatusChoices.choices)
+    created_at = django_filters.DateFilter(field_name='day')
+    created_at__lt = django_filters.DateFilter(field_name='day', lookup_expr='lt')
+    created_at__gt = django_filters.DateFilter(field_name='day', lookup_expr='gt')
+    product = django_filters.NumberFilter(field_name='product_id')  # Sadece DailyProductSales icin.
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import uuid
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.utils import validate_file_name
+from django.utils import timezone
+from PIL import Image, ImageOps, features
+
+from api.cache import bump_version
+from api.tasks import run_after_commit
+
+# images.py: Product gorselleri icin icerik hash'li depolama ve rendition (kucuk boyut) pipeline'i.
+# Neden: upload edilen tam boy orijinaller istemcilere oldugu gibi iniyordu. Upload'tan sonra
+# settings.PRODUCT_IMAGES['WIDTHS'] genisliklerinde WebP kopyalar uretilir ve ProductSerializer
+# "renditions" alaninda URL'leri doner. Uretim commit'ten sonra arka planda (api/tasks.py) calisir; upload istegi beklemez.
+#
+# Depolama (MEDIA_ROOT altinda, hepsi icerigin sha256'si ile adlanir; ayni dosya ikinci kez yazilmaz):
+#   products/ab/abcd...ef.jpg             orijinal (ayni gorsel tekrar upload edilirse ayni dosya kullanilir)
+#   renditions/ab/abcd...ef/480.webp      rendition'lar
+#   renditions/ab/abcd...ef/index.json    uretilmis boyutlar; varsa gorsel tekrar islenmez
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def images_settings():
+    return {'WIDTHS': (160, 480, 1024), 'FORMAT': 'WEBP', 'QUALITY': 80, 'WORKERS': 2, **getattr(settings, 'PRODUCT_IMAGES', {})}
+
+
+def file_digest(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks(HASH_CHUNK_SIZE):  # chunks() dosyanin basina seek eder.
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+# upload_to dizini altinda dosya adi yerine icerik hash'i kullanir: products/ab/<sha256>.<uzanti>.
+# Ayni icerik zaten varsa yeniden yazilmaz, mevcut dosyanin adi doner (dedupe).
+class ContentHashStorage(FileSystemStorage):
+    def save(self, name, content, max_length=None):
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)  # Storage.save ile ayni.
+        directory, filename = os.path.split(name)
+        digest = file_digest(content)
+        name = os.path.join(directory, digest[:2], digest + os.path.splitext(filename)[1].lower())
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length)
+
+    # Ayni ad = ayni icerik: dosya bu arada olustuysa "_abc1234" ekli ikinci bir kopya uretilmez.
+    def get_available_name(self, name, max_length=None):
+        validate_file_name(name, allow_relative_path=True)
+        return name
+
+    # Ayni hash'i ayni anda yazan iki worker exists() kontrolunu birlikte gecebilir: icerik gecici bir dosyaya
+    # yazilip hedef ada atomik olarak tasinir (os.replace). Hedef varsa ayni baytlarla degisir; okuyan
+    # taraf yarim yazilmis dosya gormez.
+    def _save(self, name, content):
+        directory, filename = os.path.split(name)
+        temporary = super()._save(os.path.join(directory, f'.{filename}.{uuid.uuid4().hex}.tmp'), content)
+        os.replace(self.path(temporary), self.path(name))
+        return name.replace('\\', '/')
+
+
+_storage = ContentHashStorage()
+_rendition_storage = FileSystemStorage()  # Ayni MEDIA_ROOT; yollar zaten orijinalin hash'ini icerir, adlar aynen yazilir.
+
+
+# Product.image'in storage'i (migration'da callable olarak referans edilir).
+def product_image_storage():
+    return _storage
+
+
+# Pillow'da WebP yoksa JPEG'e duser.
+def rendition_format():
+    image_format = images_settings()['FORMAT'].upper()
+    if image_format == 'WEBP' and not features.check('webp'):
+        return 'JPEG'
+    return image_format
+
+
+# Orijinal dosyanin rendition'larini uretir (veya hazirsa index.json'dan okur).
+# Donen dict (+ "image": dosya adi) Product.image_renditions'a yazilir:
+# {"source": sha256, "sizes": {"160": "renditions/.../160.webp", ...}}.
+# Orijinalden genis boyutlar uretilmez (buyutme yok); en kucuk boyut her zaman vardir.
+def build_renditions(name, force=False):
+    with product_image_storage().open(name, 'rb') as original:
+        data = original.read()
+    storage = _rendition_storage
+    digest = hashlib.sha256(data).hexdigest()
+    prefix = f'renditions/{digest[:2]}/{digest}'
+    index = f'{prefix}/index.json'
+    if not force and storage.exists(index):  # Ayni gorsel baska bir product icin zaten islenmis.
+        with storage.open(index, 'rb') as manifest:
+            return json.load(manifest)
+
+    config = images_settings()
+    image_format = rendition_format()
+    extension = 'jpg' if image_format == 'JPEG' else image_format.lower()
+    with Image.open(BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)  # Telefon fotograflarindaki EXIF rotasyonu piksellere uygulanir.
+        if image_format == 'JPEG':
+            image = image.convert('RGB')
+        elif image.mode not in ('RGB', 'RGBA'):  # Palet / CMYK / 16-bit vb.
+            image = image.convert('RGBA' if image.has_transparency_data else 'RGB')
+        options = {'quality': config['QUALITY'], **({'method': 4} if image_format == 'WEBP' else {'optimize': True})}
+        sizes = {}
+        for width in sorted(config['WIDTHS']):
+            if sizes and width > image.width:
+                break
+            rendition = image.copy()
+            rendition.thumbnail((width, width * 10), Image.Resampling.LANCZOS)  # En-boy orani korunur.
+            buffer = BytesIO()
+            rendition.save(buffer, image_format, **options)
+            path = f'{prefix}/{width}.{extension}'
+            if storage.exists(path):  # Ayni icerik + ayar ayni dosyayi uretir; --force ile yeniden yazilir.
+                storage.delete(path)
+            sizes[str(width)] = storage.save(path, ContentFile(buffer.getvalue()))
+
+    renditions = {'source': digest, 'sizes': sizes}
+    if storage.exists(index):
+        storage.delete(index)
+    storage.save(index, ContentFile(json.dumps(renditions).encode('utf-8')))  # En son yazilir: yarim kalan is tekrar islenir.
+    return renditions
+
+
+# Product'in rendition'larini uretip kaydeder. Gorsel bu arada degistiyse (image filtresi) yazim yapilmaz.
+# QuerySet.update() signal gondermez; product response cache'i elle gecersiz kilinir.
+def process_product_image(product_id, name, force=False):
+    from api.models import Product
+
+    renditions = {**build_renditions(name, force=force), 'image': name}  # Hangi dosyanin rendition'lari (signals.py).
+    updated = Product.objects.filter(pk=product_id, image=name).update(image_renditions=renditions, updated_at=timezone.now())
+    if updated:
+        bump_version(Product)
+    return renditions
+
+
+# Commit'ten sonra rendition uretimini arka plan kuyruguna ekler (api/tasks.py; API_TASK_WORKERS=0 ise senkron).
+# Neden: upload istegi Pillow islemesini beklemesin; commit'ten once calisirsa product satirini goremezdi.
+# Hatalar tasks.py'de loglanir; yarim kalan isler process_product_images komutu ile tamamlanir.
+def schedule_product_image(product):
+    run_after_commit(process_product_image, product.pk, product.image.name)
@@ -0,0 +1,91 @@
+import io
+import json
+import platform
+from datetime import datetime, timezone
+
+import django
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from api.benchmarks import SCENARIOS, SILK_FREE_MIDDLEWARE, build_context, measure, seed_options
+
+# benchmark_api: butun API endpoint'lerini farkli veri olceklerinde olcer.
+# Neden: latency (p50/p99), SQL sorgu sayisi ve tepe bellek icin butce koymak ve
+# sonuclari JSON olarak saklayip calistirmalar arasinda karsilastirmak.
+# Gecici bir test DB'si olusturur; gelistirme DB'sine dokunmaz.
+# Calistirma: python manage.py benchmark_api --scales 1000,10000 --output bench.json
+#             python manage.py benchmark_api --baseline bench.json
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks API endpoints at several data scales and checks performance budgets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='100,1000', help='Comma separated product/order counts to seed.')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per scenario.')
+        parser.add_argument('--scenario', action='append', help='Only run scenarios with this name (repeatable).')
+        parser.add_argument('--warm-cache', action='store_true', help='Keep the response cache between requests.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write results as JSON to this file.')
+        parser.add_argument('--baseline', help='Previous JSON result to compare p50/p99 against.')
+        parser.add_argument('--no-fail', action='store_true', help='Report budget violations without failing.')
+
+    def handle(self, *args, **options):
+        scales = [int(scale) for scale in options['scales'].split(',')]
+        scenarios = [s for s in SCENARIOS if not options['scenario'] or s.name in options['scenario']]
+        baseline = self.load_baseline(options['baseline'])
+
+        setup_test_environment()  # ALLOWED_HOSTS'a 'testserver' ekler, e-postalari bellege yonlendirir.
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(MIDDLEWARE=SILK_FREE_MIDDLEWARE):
+                results = []
+                for scale in scales:
+                    call_command('flush', interactive=False, verbosity=0)
+                    call_command('populate_db', stdout=io.StringIO(), **seed_options(scale, options['seed']))
+                    context = build_context()
+                    for scenario in scenarios:
+                        result = {'scale': scale, **measure(scenario, context, options['iterations'], options['warm_cache'])}
+                        results.append(result)
+                        self.report(result, baseline.get((scale, scenario.name)))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({'meta': self.meta(options), 'results': results}, output, indent=2)
+
+        failed = [r for r in results if r['violations']]
+        if failed and not options['no_fail']:
+            raise CommandError(f'{len(failed)} scenario(s) exceeded their budget')
+
+    def report(self, result, previous):
+        line = (
+            f'{result["scale"]:>8} {result["scenario"]:<28} q={result["queries"]:<3} '
+            f'p50={result["p50_ms"]:>8.2f}ms p99={result["p99_ms"]:>8.2f}ms peak={result["peak_kb"]:>9.1f}KB'
+        )
+        if previous:
+            line += f' (p50 x{result["p50_ms"] / max(previous["p50_ms"], 0.001):.2f} vs baseline)'
+        if result['violations']:
+            self.stdout.write(self.style.ERROR(f'{line}  FAIL: {"; ".join(result["violations"])}'))
+        else:
+            self.stdout.write(line)
+
+    def load_baseline(self, path):
+        if not path:
+            return {}
+        with open(path) as baseline:
+            return {(r['scale'], r['scenario']): r for r in json.load(baseline)['results']}
+
+    def meta(self, options):
+        return {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'iterations': options['iterations'],
+            'warm_cache': options['warm_cache'],
+        }
@@ -0,0 +1,39 @@
+import io
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.benchmarks import compare_renderers, renderer_payloads, seed_options
+
+# benchmark_renderers: DRF'in JSONRenderer'i ile ORJSONRenderer'i product ve order payload'larinda karsilastirir.
+# Neden: varsayilan renderer degisikliginin hizini olcmek ve ciktinin byte byte ayni kaldigini dogrulamak.
+# Gecici bir test DB'si olusturur; gelistirme DB'sine dokunmaz.
+# Calistirma: python manage.py benchmark_renderers --scale 5000 --limit 1000
+
+
+class Command(BaseCommand):
+    help = 'Compares JSONRenderer and ORJSONRenderer speed and output on product and order payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=2000, help='Product/order count to seed.')
+        parser.add_argument('--limit', type=int, default=1000, help='Rows per payload.')
+        parser.add_argument('--iterations', type=int, default=20, help='Renders per renderer and payload.')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            call_command('populate_db', stdout=io.StringIO(), **seed_options(options['scale'], options['seed']))
+            payloads = renderer_payloads(options['limit'])
+            results = [compare_renderers(name, payload, options['iterations']) for name, payload in payloads.items()]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        for result in results:
+            self.stdout.write(
+                f'{result["payload"]:<14} {result["bytes"]:>9}B json={result["baseline_ms"]:>8.2f}ms '
+                f'orjson={result["candidate_ms"]:>8.2f}ms x{result["speedup"]:<6} identical={result["identical"]}'
+            )
+        if not all(result['identical'] for result in results):
+            raise CommandError('ORJSONRenderer output differs from JSONRenderer')
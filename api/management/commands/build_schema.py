@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.schema import generate_schema, render_schema, reset_document
+
+# build_schema: OpenAPI schema'sini koddan uretip settings.API_SCHEMA_FILE'a (schema.yml) yazar.
+# Neden: /api/schema/ (api/schema.py) schema'yi her istekte uretmek yerine bu dosyadan servis eder.
+# Deploy'da (collectstatic gibi) ve view/serializer degisikliklerinden sonra calistirilmali.
+# Calistirma: python manage.py build_schema
+#             python manage.py build_schema --check   (dosya koddan farkliysa hata verir; CI icin)
+
+
+class Command(BaseCommand):
+    help = 'Generates the OpenAPI schema file served at /api/schema/'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=settings.API_SCHEMA_FILE, help='Schema file path (default: API_SCHEMA_FILE).')
+        parser.add_argument('--check', action='store_true', help='Only compare the file with the generated schema; fail on drift.')
+
+    def handle(self, *args, **options):
+        path = Path(options['file'])
+        content = render_schema(generate_schema())
+        if options['check']:
+            if not path.exists() or path.read_bytes() != content:
+                raise CommandError(f'{path} is out of date with the code; run manage.py build_schema')
+            self.stdout.write(self.style.SUCCESS(f'{path} is up to date'))
+            return
+
+        path.write_bytes(content)
+        reset_document()
+        self.stdout.write(f'Wrote {len(content)} bytes to {path}')
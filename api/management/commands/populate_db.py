@@ -1,38 +1,117 @@
 import random
+import uuid
+from array import array
 from decimal import Decimal
+from itertools import islice
 
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import lorem_ipsum
-from api.models import User, Product, Order, OrderItem
+from api.cache import bump_version
+from api.models import User, Product, Order, OrderItem, defer_sales_rollups
 
 # populate_db: ornek veri ureten management command.
-# Neden: gelistirme/test icin hizli dummy data uretmek.
+# Neden: gelistirme/test icin hizli dummy data uretmek; buyuk degerlerle prod olcegindeki
+# performans problemlerini lokalde tekrar uretmek (yuk testi).
 # Calistirma: python manage.py populate_db
+#             python manage.py populate_db --products 100000 --users 1000 --orders 500000 --items-per-order 3 --seed 42
+
+# Ilk urunler her zaman bunlar (name, price, stock); geri kalanlar sentetik uretilir.
+SAMPLE_PRODUCTS = [
+    ("A Scanner Darkly", Decimal('12.99'), 4),
+    ("Coffee Machine", Decimal('70.99'), 6),
+    ("Velvet Underground & Nico", Decimal('15.99'), 11),
+    ("Enter the Wu-Tang (36 Chambers)", Decimal('17.99'), 2),
+    ("Digital Camera", Decimal('350.99'), 4),
+    ("Watch", Decimal('500.05'), 0),
+]
+
+ADJECTIVES = ['Compact', 'Classic', 'Wireless', 'Deluxe', 'Portable', 'Vintage', 'Smart', 'Ultra']
+NOUNS = ['Camera', 'Speaker', 'Lamp', 'Kettle', 'Backpack', 'Monitor', 'Record', 'Watch']
+DESCRIPTION_COUNT = 16  # Aciklamalar bu sabit kumeden secilir; her urun icin metin uretilmez.
+
+
+# Iterable'i batch_size'lik listelere boler; bellekte sadece bir chunk tutulur.
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
 
 class Command(BaseCommand):
     help = 'Creates application data'  # manage.py help listesinde gorunen aciklama.
 
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=len(SAMPLE_PRODUCTS), help='Number of products to create.')
+        parser.add_argument('--users', type=int, default=0, help='Number of regular users to create (admin is always ensured).')
+        parser.add_argument('--orders', type=int, default=3, help='Number of orders to create.')
+        parser.add_argument('--items-per-order', type=int, default=2, help='Distinct products per order.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create chunk.')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible runs.')
+
     # handle: komut calistiginda tetiklenen ana fonksiyon.
-    def handle(self, *args, **kwargs):
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])  # Tum rastgelelik tek, seed'lenebilir generator'dan gelir.
+        self.batch_size = options['batch_size']
+
         user = User.objects.filter(username='admin').first()  # Admin user varsa al.
         if not user:
             user = User.objects.create_superuser(username='admin', password='test')  # Yoksa olustur.
 
-        products = [
-            Product(name="A Scanner Darkly", description=lorem_ipsum.paragraph(), price=Decimal('12.99'), stock=4),
-            Product(name="Coffee Machine", description=lorem_ipsum.paragraph(), price=Decimal('70.99'), stock=6),
-            Product(name="Velvet Underground & Nico", description=lorem_ipsum.paragraph(), price=Decimal('15.99'), stock=11),
-            Product(name="Enter the Wu-Tang (36 Chambers)", description=lorem_ipsum.paragraph(), price=Decimal('17.99'), stock=2),
-            Product(name="Digital Camera", description=lorem_ipsum.paragraph(), price=Decimal('350.99'), stock=4),
-            Product(name="Watch", description=lorem_ipsum.paragraph(), price=Decimal('500.05'), stock=0),
-        ]  # Ornek product listesi (name, desc, price, stock).
-
-        Product.objects.bulk_create(products)  # Toplu ekleme (performansli).
-        products = Product.objects.all()  # DB'den tekrar cek.
-
-        for _ in range(3):  # 3 adet ornek order olustur.
-            order = Order.objects.create(user=user)  # Order admin user'a ait.
-            for product in random.sample(list(products), 2):  # Her order'a 2 urun ekle.
-                OrderItem.objects.create(
-                    order=order, product=product, quantity=random.randint(1,3)
-                )
+        self.create_users(options['users'])
+        self.create_products(options['products'])
+        with defer_sales_rollups():  # Satis rollup'lari her chunk'ta degil, sonda bir kez hesaplanir.
+            self.create_orders(options['orders'], options['items_per_order'])
+
+    def create_users(self, count):
+        password = make_password('test')  # Hash bir kez hesaplanir; her user icin PBKDF2 calismasin.
+        offset = User.objects.count()
+        users = (User(username=f'user{offset + i}', password=password) for i in range(count))
+        for chunk in chunked(users, self.batch_size):
+            User.objects.bulk_create(chunk, ignore_conflicts=True)  # Ayni isim varsa atlanir.
+        self.stdout.write(f'Users: {count} created')
+
+    def create_products(self, count):
+        descriptions = [
+            ' '.join(self.rng.choice(lorem_ipsum.WORDS) for _ in range(40)).capitalize() + '.'
+            for _ in range(DESCRIPTION_COUNT)
+        ]  # Sabit aciklama kumesi.
+
+        def products():
+            for i in range(count):
+                if i < len(SAMPLE_PRODUCTS):
+                    name, price, stock = SAMPLE_PRODUCTS[i]
+                else:
+                    name = f'{self.rng.choice(ADJECTIVES)} {self.rng.choice(NOUNS)} {i}'
+                    price = Decimal(self.rng.randint(100, 100000)) / 100
+                    stock = self.rng.randint(0, 500)
+                yield Product(name=name, description=self.rng.choice(descriptions), price=price, stock=stock)
+
+        for chunk in chunked(products(), self.batch_size):
+            Product.objects.bulk_create(chunk)  # Toplu ekleme (performansli).
+        bump_version(Product)  # bulk_create signal gondermez; product response cache'ini elle gecersiz kil.
+        self.stdout.write(f'Products: {count} created')
+
+    def create_orders(self, count, items_per_order):
+        # Sadece id'ler tutulur (array: eleman basina 8 byte); model instance'lari bellekte birikmez.
+        user_ids = array('q', User.objects.order_by('pk').values_list('pk', flat=True).iterator())
+        product_ids = array('q', Product.objects.order_by('pk').values_list('pk', flat=True).iterator())
+        items_per_order = min(items_per_order, len(product_ids))
+        statuses = Order.StatusChoices.values
+
+        created = 0
+        for chunk_size in (min(self.batch_size, count - start) for start in range(0, count, self.batch_size)):
+            orders, items = [], []
+            for _ in range(chunk_size):
+                order_id = uuid.UUID(int=self.rng.getrandbits(128), version=4)  # UUID'ler onceden uretilir; item'lar ayni chunk'ta baglanir.
+                orders.append(Order(order_id=order_id, user_id=self.rng.choice(user_ids), status=self.rng.choice(statuses)))
+                items += [
+                    OrderItem(order_id=order_id, product_id=product_id, quantity=self.rng.randint(1, 3))
+                    for product_id in self.rng.sample(product_ids, items_per_order)
+                ]
+            with transaction.atomic():
+                Order.objects.bulk_create(orders)
+                OrderItem.objects.bulk_create(items, batch_size=self.batch_size)
+            created += chunk_size
+            self.stdout.write(f'Orders: {created}/{count}')
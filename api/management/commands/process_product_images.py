@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.images import images_settings, process_product_image
+from api.models import Product
+
+# process_product_images: mevcut product gorsellerinin rendition'larini toplu olarak (paralel) uretir.
+# Neden: pipeline'dan once upload edilmis gorseller, WIDTHS/FORMAT ayari degistiginde veya arka plan
+# isi yarim kaldiginda (process restart) rendition'lari doldurmak icin. Pillow resize/encode sirasinda GIL'i
+# biraktigi icin thread'ler CPU cekirdeklerini kullanir. Ayni icerikli gorseller bir kez islenir (index.json).
+# Calistirma: python manage.py process_product_images --workers 8
+#             python manage.py process_product_images --force   (hazir olanlar dahil hepsini yeniden uretir)
+
+
+class Command(BaseCommand):
+    help = 'Generates missing product image renditions in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Worker threads (default: PRODUCT_IMAGES["WORKERS"]).')
+        parser.add_argument('--force', action='store_true', help='Regenerate renditions that already exist.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Products read per query.')
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or images_settings()['WORKERS'] or 1
+        products = Product.objects.exclude(image='').exclude(image__isnull=True).order_by('pk')
+        pending = [
+            (product_id, name)
+            for product_id, name, renditions in products.values_list('pk', 'image', 'image_renditions').iterator(
+                chunk_size=options['batch_size']
+            )
+            if options['force'] or renditions.get('image') != name
+        ]
+        skipped = products.count() - len(pending)
+        processed = failed = 0
+        for product_id, error in self.run(pending, workers, options['force']):
+            if error is None:
+                processed += 1
+            else:  # Bozuk/eksik dosya tum backfill'i durdurmasin.
+                failed += 1
+                self.stderr.write(f'Product {product_id}: {error}')
+
+        self.stdout.write(f'Processed {processed} product image(s), skipped {skipped} up to date')
+        if failed:
+            raise CommandError(f'{failed} product image(s) failed')
+
+    # (product_id, hata veya None) uretir. --workers 1 ayni thread'de (ve ayni DB baglantisinda) calisir.
+    def run(self, pending, workers, force):
+        if workers <= 1:
+            for product_id, name in pending:
+                yield product_id, self.process(product_id, name, force)
+            return
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='product-images') as pool:
+            futures = {pool.submit(self.process_in_thread, product_id, name, force): product_id for product_id, name in pending}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def process(self, product_id, name, force):
+        try:
+            process_product_image(product_id, name, force=force)
+        except Exception as exc:
+            return exc
+        return None
+
+    def process_in_thread(self, product_id, name, force):
+        try:
+            return self.process(product_id, name, force)
+        finally:
+            connection.close()  # Thread'in DB baglantisi.
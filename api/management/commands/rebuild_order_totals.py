@@ -0,0 +1,44 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from api.models import Order, refresh_order_totals
+
+# rebuild_order_totals: Order.total_price / item_count kolonlarini OrderItem'lardan yeniden hesaplar.
+# Neden: denormalize kolonlar signal'lar ve OrderItemQuerySet ile guncel tutulur; raw SQL veya
+# migration gibi bu yollari atlayan yazimlardan sonra kolonlari duzeltmek ve dogrulamak icin.
+# Calistirma: python manage.py rebuild_order_totals
+#             python manage.py rebuild_order_totals --verify   (sadece kontrol; fark varsa hata verir)
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds and verifies the materialized Order.total_price and Order.item_count columns'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help='Only check the stored totals; fail on mismatches.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Orders per UPDATE statement.')
+
+    def handle(self, *args, **options):
+        if not options['verify']:
+            order_ids = Order.objects.order_by('pk').values_list('pk', flat=True)
+            refresh_order_totals(order_ids.iterator(), batch_size=options['batch_size'])
+            self.stdout.write(f'Rebuilt totals for {order_ids.count()} orders')
+
+        mismatches = self.mismatches()
+        if mismatches:
+            raise CommandError(f'{mismatches} order(s) have stale totals; run rebuild_order_totals')
+        self.stdout.write(self.style.SUCCESS('Order totals verified'))
+
+    # Saklanan degerleri OrderItem'lardan hesaplananla karsilastirir; farkli order sayisini dondurur.
+    def mismatches(self):
+        expected = Order.objects.annotate(
+            expected_total=Coalesce(
+                Sum(F('items__quantity') * F('items__product__price')),
+                Value(Decimal('0.00')),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ),
+            expected_count=Count('items'),
+        )
+        return expected.filter(~Q(total_price=F('expected_total')) | ~Q(item_count=F('expected_count'))).count()
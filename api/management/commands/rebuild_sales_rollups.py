@@ -0,0 +1,60 @@
+from datetime import date
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import TruncDate
+
+from api.models import DailyProductSales, DailySales, Order, compute_sales_rollups, refresh_sales_rollups
+
+# rebuild_sales_rollups: DailySales / DailyProductSales tablolarini Order ve OrderItem'dan gun gun yeniden hesaplar.
+# Neden: rollup'lar yazim hook'lari ile guncel tutulur; raw SQL, fixture yukleme gibi bu yollari
+# atlayan yazimlardan sonra tablolari duzeltmek ve dogrulamak icin.
+# Calistirma: python manage.py rebuild_sales_rollups
+#             python manage.py rebuild_sales_rollups --since 2026-01-01 --until 2026-01-31
+#             python manage.py rebuild_sales_rollups --verify   (sadece kontrol; fark varsa hata verir)
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds and verifies the daily sales rollup tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=date.fromisoformat, help='First day to rebuild (YYYY-MM-DD).')
+        parser.add_argument('--until', type=date.fromisoformat, help='Last day to rebuild (YYYY-MM-DD).')
+        parser.add_argument('--batch-days', type=int, default=31, help='Days recomputed per transaction.')
+        parser.add_argument('--verify', action='store_true', help='Only compare the stored rollups; fail on mismatches.')
+
+    def handle(self, *args, **options):
+        days = self.days(options['since'], options['until'])
+        if not options['verify']:
+            for batch in self.batches(days, options['batch_days']):
+                refresh_sales_rollups(batch)
+            self.stdout.write(f'Rebuilt sales rollups for {len(days)} days')
+
+        stale = [day for batch in self.batches(days, options['batch_days']) for day in self.stale_days(batch)]
+        if stale:
+            raise CommandError(f'{len(stale)} day(s) have stale rollups (first: {stale[0]}); run rebuild_sales_rollups')
+        self.stdout.write(self.style.SUCCESS('Sales rollups verified'))
+
+    # Order'i olan gunler + rollup'i olan gunler (order'lari silinmis gunlerin satirlari da temizlensin).
+    def days(self, since, until):
+        days = set(Order.objects.order_by().values_list(TruncDate('created_at'), flat=True).distinct())
+        days |= set(DailySales.objects.values_list('day', flat=True).distinct())
+        days |= set(DailyProductSales.objects.values_list('day', flat=True).distinct())
+        return sorted(day for day in days if (since is None or day >= since) and (until is None or day <= until))
+
+    def batches(self, days, size):
+        days = iter(days)
+        while batch := list(islice(days, size)):
+            yield batch
+
+    # Saklanan satirlari yeniden hesaplananla karsilastirir; farkli olan gunleri dondurur.
+    def stale_days(self, days):
+        day_rows, product_rows = compute_sales_rollups(days)
+        expected_days = {(r.day, r.status, r.revenue, r.units, r.orders) for r in day_rows}
+        expected_products = {(r.day, r.status, r.product_id, r.revenue, r.units, r.orders) for r in product_rows}
+        stored_days = set(DailySales.objects.filter(day__in=days).values_list('day', 'status', 'revenue', 'units', 'orders'))
+        stored_products = set(
+            DailyProductSales.objects.filter(day__in=days)
+            .values_list('day', 'status', 'product_id', 'revenue', 'units', 'orders')
+        )
+        return sorted({row[0] for row in expected_days ^ stored_days} | {row[0] for row in expected_products ^ stored_products})
@@ -0,0 +1,305 @@
+import hmac
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+# metrics.py: endpoint bazli latency / SQL sorgu sayisi / sorgu suresi / response boyutu histogramlari.
+# Neden: Silk'in DB'ye yazdigi kayitlar disinda her istekte calisabilecek kadar ucuz bir olcum;
+# Prometheus /metrics endpoint'inden text formatinda okur.
+# Etiketler: route (URL pattern'i, orn. "products/<int:product_id>/"), method; sayacta ayrica status.
+# Coklu process: API_METRICS['DIR'] verilirse her process kendi durumunu metrics-<pid>.json dosyasina
+# en fazla FLUSH_INTERVAL saniyede bir yazar; /metrics tum dosyalari toplayarak doner. Calismayan process'lerin
+# dosyalari silinir (bkz. live_worker_files); DIR host basina ayri olmali (pid'ler sadece host icinde tekil).
+# /metrics route listesi ve latency'leri icerdigi icin sadece staff session'ina veya
+# "Authorization: Bearer <API_METRICS['TOKEN']>" gonderen scraper'a aciktir.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+QUERY_TIME_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# (metrik adi, aciklama, bucket'lar); RouteMetrics.histograms ile ayni sira.
+HISTOGRAMS = (
+    ('api_request_duration_seconds', 'Request latency by route and method.', LATENCY_BUCKETS),
+    ('api_request_db_queries', 'SQL queries executed per request.', QUERY_COUNT_BUCKETS),
+    ('api_request_db_duration_seconds', 'Time spent in SQL queries per request.', QUERY_TIME_BUCKETS),
+    ('api_response_size_bytes', 'Response body size (non-streaming responses).', SIZE_BUCKETS),
+)
+UNMATCHED_ROUTE = '<unmatched>'  # URL resolve edilemediyse (404); path'ler etiket olarak kullanilmaz.
+METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+OTHER_METHOD = 'other'  # Method token'ini istemci serbestce secer; digerleri tek etikette toplanir (sinirli seri sayisi).
+
+
+def metrics_settings():
+    return {
+        'DIR': None, 'FLUSH_INTERVAL': 1.0, 'EXCLUDE_PATHS': ('/metrics',), 'TOKEN': None,
+        **getattr(settings, 'API_METRICS', {}),
+    }
+
+
+# Tek route + method icin histogramlar ve status sayaclari.
+# Histogram: bucket basina (kumulatif olmayan) sayaclar + son eleman +Inf; render'da kumulatif yazilir.
+class RouteMetrics:
+    __slots__ = ('histograms', 'sums', 'statuses')
+
+    def __init__(self):
+        self.histograms = [[0] * (len(buckets) + 1) for _, _, buckets in HISTOGRAMS]
+        self.sums = [0.0] * len(HISTOGRAMS)
+        self.statuses = {}
+
+    def observe(self, status, values):
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        for index, value in enumerate(values):
+            if value is None:
+                continue
+            self.histograms[index][bisect_left(HISTOGRAMS[index][2], value)] += 1
+            self.sums[index] += value
+
+    def to_dict(self):
+        return {'histograms': self.histograms, 'sums': self.sums, 'statuses': self.statuses}
+
+    def merge(self, data):
+        for counts, other in zip(self.histograms, data['histograms']):
+            for index, count in enumerate(other):
+                counts[index] += count
+        self.sums = [total + other for total, other in zip(self.sums, data['sums'])]
+        for status, count in data['statuses'].items():
+            self.statuses[str(status)] = self.statuses.get(str(status), 0) + count
+
+
+# Process ici metrik deposu. observe() kilit altinda sadece birkac liste artirimi yapar.
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.routes = {}
+        self.last_flush = time.monotonic()
+
+    def observe(self, route, method, status, duration, queries, query_time, size):
+        with self.lock:
+            metrics = self.routes.get((route, method))
+            if metrics is None:
+                metrics = self.routes[route, method] = RouteMetrics()
+            metrics.observe(str(status), (duration, queries, query_time, size))
+
+    def snapshot(self):
+        with self.lock:
+            return [{'route': route, 'method': method, **metrics.to_dict()} for (route, method), metrics in self.routes.items()]
+
+    # Durum dosyasini en fazla interval saniyede bir (atomik olarak) yazar.
+    def maybe_flush(self, directory, interval):
+        now = time.monotonic()
+        if now - self.last_flush < interval:
+            return
+        self.last_flush = now
+        self.flush(directory)
+
+    def flush(self, directory):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'metrics-{os.getpid()}.json'
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, path)
+
+
+registry = MetricsRegistry()
+os.register_at_fork(after_in_child=registry.reset)  # Fork edilen worker parent'in sayaclarini tekrar raporlamasin.
+
+
+# metrics-<pid>.json'u yazan process (ayni host'ta) hala calisiyor mu.
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # Baska kullanicinin process'i.
+        return True
+    return True
+
+
+# DIR'deki diger process'lerin dosyalari; calismayan process'lerinkiler silinir.
+# Neden: olen/yeniden baslatilan worker'larin (onceki deploy'lar dahil) sayaclari sonsuza kadar toplanmasin ve
+# ayni pid'i alan yeni process eski process'in sayaclarini devralmasin. Bu process'lerin sayaclari /metrics'ten
+# duser; Prometheus bunu counter reset olarak gorur (rate()/increase() etkilenmez).
+def live_worker_files(directory):
+    own = os.getpid()
+    files = []
+    for path in sorted(Path(directory).glob('metrics-*.json')):
+        try:
+            pid = int(path.stem.removeprefix('metrics-'))
+        except ValueError:
+            continue
+        if pid == own:
+            continue
+        if pid_alive(pid):
+            files.append(path)
+        else:
+            path.unlink(missing_ok=True)
+    return files
+
+
+# Tum process'lerin snapshot'larini route + method bazinda birlestirir.
+# Bu process'in dosyasi yerine canli durumu kullanilir (son flush'tan sonraki istekler de gorunsun).
+def collect():
+    directory = metrics_settings()['DIR']
+    snapshots = [registry.snapshot()]
+    if directory:
+        for path in live_worker_files(directory):
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):  # Yazilmakta olan / silinmis dosya.
+                continue
+    merged = {}
+    for snapshot in snapshots:
+        for entry in snapshot:
+            key = (entry['route'], entry['method'])
+            if key not in merged:
+                merged[key] = RouteMetrics()
+            merged[key].merge(entry)
+    return merged
+
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+# Prometheus text exposition formati (version 0.0.4).
+def render(merged):
+    lines = []
+    routes = sorted(merged.items())
+    for index, (name, help_text, buckets) in enumerate(HISTOGRAMS):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for (route, method), metrics in routes:
+            labels = f'route="{escape_label(route)}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip((*buckets, '+Inf'), metrics.histograms[index]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {metrics.sums[index]!r}')
+            lines.append(f'{name}_count{{{labels}}} {cumulative}')
+    lines += ['# HELP api_requests_total Requests by route, method and status.', '# TYPE api_requests_total counter']
+    for (route, method), metrics in routes:
+        for status, count in sorted(metrics.statuses.items()):
+            lines.append(f'api_requests_total{{route="{escape_label(route)}",method="{method}",status="{status}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+# Istek boyunca calisan sorgu sayisini ve toplam suresini sayar (count_queries uzerinden).
+class QueryCounter:
+    __slots__ = ('count', 'duration')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+_query_counter = ContextVar('api_metrics_query_counter', default=None)
+
+
+# Her DB baglantisinda kalici duran execute wrapper: sorguyu o anki istegin QueryCounter'ina yazar.
+# Neden: Django baglantilari thread'e bagli; async zincirde middleware event loop thread'inde, async ORM
+# sorgulari sync_to_async thread'inde calisir. Contextvar sync_to_async'e tasinir, baglanti nesnesi tasinmaz.
+def count_queries(execute, sql, params, many, context):
+    counter = _query_counter.get()
+    if counter is None:  # Istek disi (management command, arka plan isi) veya EXCLUDE_PATHS.
+        return execute(sql, params, many, context)
+    return counter(execute, sql, params, many, context)
+
+
+# connection_created receiver'i (apps.py); yeniden baglanan baglantiya ikinci kez eklenmez.
+# Listenin basina eklenir: execute_wrapper() context manager'lari cikarken kendi wrapper'larini pop() eder.
+def install_query_counter(sender, connection, **kwargs):
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, count_queries)
+
+
+# Her istegin latency, sorgu sayisi/suresi ve response boyutunu registry'e yazar.
+# settings.MIDDLEWARE'in basinda durur: latency ve sorgu sayisi istemcinin gordugu gibi diger middleware'leri
+# (session, auth, Silk'in ornekledigi isteklerdeki kayit sorgulari) da kapsar.
+# Sync ve async calisabilir: ASGI altinda async view'lere giden zincirde thread'e gecis eklemez.
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        config = metrics_settings()
+        self.directory = config['DIR']
+        self.flush_interval = config['FLUSH_INTERVAL']
+        self.exclude_paths = tuple(config['EXCLUDE_PATHS'])
+        if self.directory and Path(self.directory).is_dir():
+            live_worker_files(self.directory)  # Baslangicta onceki process'lerin dosyalarini temizler.
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.path.startswith(self.exclude_paths):
+            return self.get_response(request)
+        counter, token, start = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_counter.reset(token)
+        return self.observe(request, response, counter, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if request.path.startswith(self.exclude_paths):
+            return await self.get_response(request)
+        counter, token, start = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _query_counter.reset(token)
+        return self.observe(request, response, counter, time.perf_counter() - start)
+
+    # Sorgular hangi thread'de/alias'ta calisirsa calissin count_queries ile bu counter'a yazilir.
+    def start(self):
+        counter = QueryCounter()
+        return counter, _query_counter.set(counter), time.perf_counter()
+
+    def observe(self, request, response, counter, duration):
+        match = request.resolver_match
+        route = match.route if match is not None else UNMATCHED_ROUTE
+        method = request.method if request.method in METHODS else OTHER_METHOD
+        size = None if response.streaming else len(response.content)
+        registry.observe(route, method, response.status_code, duration, counter.count, counter.duration, size)
+        if self.directory:
+            registry.maybe_flush(self.directory, self.flush_interval)
+        return response
+
+
+# Staff session'i veya API_METRICS['TOKEN'] ile ayni bearer token (sabit zamanli karsilastirma).
+def can_read_metrics(request):
+    token = metrics_settings()['TOKEN']
+    scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+    if token and scheme.lower() == 'bearer' and hmac.compare_digest(credentials.encode(), token.encode()):
+        return True
+    return request.user.is_staff
+
+
+# GET /metrics: Prometheus scrape endpoint'i (DRF disi; auth/renderer maliyeti yok).
+def metrics_view(request):
+    if not can_read_metrics(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render(collect()), content_type='text/plain; version=0.0.4; charset=utf-8')
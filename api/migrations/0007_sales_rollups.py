@@ -0,0 +1,80 @@
+# Generated by Django 5.1.1 on 2026-10-18 15:38
+
+from collections import Counter
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDate
+
+
+# Mevcut order'lar icin rollup tablolarini doldurur (api.models.compute_sales_rollups ile ayni toplamlar).
+def fill_sales_rollups(apps, schema_editor):
+    Order = apps.get_model('api', 'Order')
+    OrderItem = apps.get_model('api', 'OrderItem')
+    DailySales = apps.get_model('api', 'DailySales')
+    DailyProductSales = apps.get_model('api', 'DailyProductSales')
+
+    units = Counter()
+    product_rows = []
+    lines = (
+        OrderItem.objects.values('product', day=TruncDate('order__created_at'), status=F('order__status'))
+        .annotate(
+            revenue=Sum(ExpressionWrapper(F('quantity') * F('product__price'),
+                                          output_field=models.DecimalField(max_digits=14, decimal_places=2))),
+            units=Sum('quantity'),
+            orders=Count('order', distinct=True),
+        )
+        .order_by()
+    )
+    for row in lines.iterator():
+        units[row['day'], row['status']] += row['units']
+        product_rows.append(DailyProductSales(product_id=row.pop('product'), **row))
+    DailyProductSales.objects.bulk_create(product_rows, batch_size=1000)
+
+    days = Order.objects.values('status', day=TruncDate('created_at')).annotate(revenue=Sum('total_price'), orders=Count('pk')).order_by()
+    DailySales.objects.bulk_create(
+        [DailySales(units=units[row['day'], row['status']], **row) for row in days.iterator()], batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_order_materialized_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Confirmed', 'Confirmed'), ('Cancelled', 'Cancelled')], max_length=10)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('units', models.PositiveBigIntegerField(default=0)),
+                ('orders', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'status'), name='daily_sales_day_status_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyProductSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Confirmed', 'Confirmed'), ('Cancelled', 'Cancelled')], max_length=10)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('units', models.PositiveBigIntegerField(default=0)),
+                ('orders', models.PositiveIntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='api.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', 'day'], name='daily_product_sales_prod_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'status', 'product'), name='daily_product_sales_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_sales_rollups, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,21 @@
+import threading
 import uuid
-from django.db import models
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.db import models, transaction
+from django.db.models import Count, ExpressionWrapper, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate, Upper
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
+
+from api.cache import bump_version
+from api.images import product_image_storage
+from api.tasks import submit
 
 # models.py: veritabani tablolarini ve iliskileri tanimlar.
 # Neden: ORM uzerinden DB schema'sini tek yerde kontrol etmek.
@@ -15,18 +30,148 @@ class Product(models.Model):
     description = models.TextField()  # Uzun aciklama; length limiti yok.
     price = models.DecimalField(max_digits=10, decimal_places=2)  # Para icin Decimal kullanilir (float hata yapabilir).
     stock = models.PositiveIntegerField()  # Negatif olamaz; stok sayisi.
-    image = models.ImageField(upload_to='products/', blank=True, null=True)  # Opsiyonel resim; MEDIA_ROOT/products/ altina kaydeder.
+    # Opsiyonel resim; MEDIA_ROOT/products/ altina icerik hash'i ile kaydedilir (ayni dosya bir kez saklanir, images.py).
+    image = models.ImageField(upload_to='products/', storage=product_image_storage, blank=True, null=True)
+    # Arka planda uretilen kucuk boyutlar: {"source": sha256, "sizes": {"160": "renditions/...", ...}}; bos ise henuz yok.
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)  # Her save()'de guncellenir; Last-Modified/ETag icin.
+
+    class Meta:
+        # /products/ listesi her zaman InStockFilterBackend'den (stock > 0) gecer; index'ler bu yuzden
+        # partial: sadece stoktaki satirlari tutar, stok disi urunler icin yazim maliyeti yok.
+        # (alan, id): keyset pagination ("ORDER BY price, id WHERE (price, id) > (..)"), ?ordering= ve
+        # price__lt/gt/range filtreleri index uzerinden okunsun. Upper(name): name__iexact (ProductFilter).
+        # name__icontains ("LIKE '%..%'") B-tree index kullanamaz; metin aramasi icin ?search= (search.py).
+        indexes = [
+            models.Index(fields=['id'], name='product_in_stock_idx', condition=Q(stock__gt=0)),
+            models.Index(fields=['name', 'id'], name='product_in_stock_name_idx', condition=Q(stock__gt=0)),
+            models.Index(fields=['price', 'id'], name='product_in_stock_price_idx', condition=Q(stock__gt=0)),
+            models.Index(fields=['stock', 'id'], name='product_in_stock_stock_idx', condition=Q(stock__gt=0)),
+            models.Index(Upper('name'), name='product_in_stock_uname_idx', condition=Q(stock__gt=0)),
+        ]
+
+    ORDER_FIELDS = ('name', 'price')  # Order response'unun product'tan okudugu alanlar (product_name, product_price).
+
+    # DB'den okunan name/price saklanir; kayitta degisip degismedikleri order_fields_changed() ile anlasilir.
+    # Neden: stok gibi order'lari etkilemeyen yazimlar onu iceren tum order'lari yeniden yazmasin (signals.py).
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_order_fields()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.remember_order_fields()
+
+    def remember_order_fields(self):
+        self._saved_order_fields = {name: self.__dict__.get(name) for name in self.ORDER_FIELDS}  # Deferred ise None.
+
+    # update_fields verildiyse ona, yoksa DB'den okunan degerlere bakar; bilinmiyorsa degismis sayilir.
+    def order_fields_changed(self, update_fields=None):
+        if update_fields is not None and not set(self.ORDER_FIELDS) & set(update_fields):
+            return False
+        saved = getattr(self, '_saved_order_fields', None)
+        return saved is None or any(saved[name] != getattr(self, name) for name in self.ORDER_FIELDS)
 
     # DB'de alan degil, hesaplanan property; neden: stok kontrolunu kolay okumak.
     @property
     def in_stock(self):
         return self.stock > 0
 
+    # Ucuz versiyon token'i (pk + updated_at); ETag olarak kullanilir.
+    @property
+    def version_token(self):
+        return f'{self.pk}-{self.updated_at.timestamp():.6f}'
+
     # Admin/console'da okunabilir isim.
     def __str__(self):
         return self.name
 
 
+# Order QuerySet'i: materialize edilmis toplamlari (total_price, item_count) yeniden hesaplama.
+# Toplu yazimlar (bulk_create/update) signal gondermedigi icin satis rollup'larini burada isaretler.
+class OrderQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        schedule_sales_rollups({timezone.localdate(obj.created_at) for obj in objs})
+        bump_version(Order)  # /orders/ Last-Modified'i (signals.py'deki post_save'in karsiligi).
+        return objs
+
+    # Dogrudan UPDATE'ler (status, created_at vb.) etkilenen order'larin gunlerini commit'te yeniden toplatir.
+    # refresh_totals() bu yoldan gecmez: item yazimlarinda gunleri cagiran taraf isaretler.
+    def update(self, **kwargs):
+        days = set(self.sales_days())
+        rows = super().update(**kwargs)
+        if 'created_at' in kwargs:
+            days.add(timezone.localdate(kwargs['created_at']))
+        schedule_sales_rollups(days)
+        bump_version(Order)
+        return rows
+
+    # Secili order'larin (yerel saat dilimine gore) olusturulma gunleri.
+    def sales_days(self):
+        return self.order_by().values_list(TruncDate('created_at'), flat=True).distinct()
+
+    # Secili order'larin toplamlarini OrderItem'lardan tek UPDATE (correlated subquery) ile yeniden yazar.
+    # Neden: her yazmada sadece etkilenen order'lar guncellenir; okumada hesaplama yapilmaz.
+    # Rollup'lara dokunmaz (update() override'i atlanir); item yazim yollari gunu schedule_sales_rollups ile isaretler.
+    def refresh_totals(self):
+        lines = OrderItem.objects.filter(order=OuterRef('pk')).order_by().values('order')
+        rows = super().update(
+            total_price=Coalesce(
+                Subquery(lines.annotate(total=Sum(F('quantity') * F('product__price'))).values('total')),
+                Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2),
+            ),
+            item_count=Coalesce(Subquery(lines.annotate(count=Count('pk')).values('count')), Value(0)),
+            updated_at=timezone.now(),  # Toplam degistiyse order response'u da degisir (ETag/Last-Modified).
+        )
+        bump_version(Order)
+        return rows
+
+
+# Verilen order id'lerinin toplamlarini batch'ler halinde yeniler (cok buyuk IN listelerinden kacinir).
+# sales=True: order'larin gunlerinin satis rollup'lari da commit'ten sonra yenilenir (item/fiyat degisiklikleri).
+def refresh_order_totals(order_ids, batch_size=1000, sales=False):
+    order_ids = iter(order_ids)
+    while batch := list(islice(order_ids, batch_size)):
+        orders = Order.objects.filter(pk__in=batch)
+        orders.refresh_totals()
+        if sales:
+            schedule_sales_rollups(orders.sales_days())
+
+
+_pending_totals = threading.local()  # Commit bekleyen order id'leri (thread basina, _pending_sales gibi).
+
+
+# Order'larin toplamlarini commit'te tek refresh_order_totals() ile yeniler (tekil OrderItem yazimlari, signals.py).
+# Neden: cascade silmelerde (product silinince) her item icin ayri UPDATE + SELECT atilmasin; ayni transaction'daki
+# tum item yazimlari order basina tek yenilemede birlesir. Transaction disinda on_commit hemen calisir.
+# Yenileme arka plana verilmez: istegin kendi response'u guncel toplami gormeli.
+def schedule_order_totals(order_ids):
+    pending = getattr(_pending_totals, 'order_ids', None)
+    if pending is None:
+        pending = _pending_totals.order_ids = set()
+    pending.update(order_ids)
+    transaction.on_commit(_flush_order_totals)  # Ilk callback tum id'leri alir (schedule_sales_rollups gibi).
+
+
+# Silinen order'lar UPDATE'te eslesmez; gunleri Order post_delete signal'i isaretler.
+def _flush_order_totals():
+    order_ids = getattr(_pending_totals, 'order_ids', None)
+    if order_ids:
+        _pending_totals.order_ids = set()
+        refresh_order_totals(order_ids, sales=True)
+
+
+# Product'i iceren tum order'larin toplamlarini (guncel fiyat) ve updated_at'ini batch'ler halinde yeniler.
+# Product'in name/price'i degisince commit'ten sonra arka planda calisir (signals.py, tasks.py).
+def refresh_orders_of_product(product_id, batch_size=1000):
+    order_ids = OrderItem.objects.filter(product_id=product_id).order_by().values_list('order_id', flat=True).distinct()
+    refresh_order_totals(order_ids.iterator(chunk_size=batch_size), batch_size=batch_size, sales=True)
+
+
 class Order(models.Model):
     # Order durumlarini sabitlemek icin TextChoices kullanilir.
     class StatusChoices(models.TextChoices):
@@ -38,24 +183,215 @@ class Order(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)  # Siparisi veren kullanici; user silinirse order'lar silinir.
     created_at = models.DateTimeField(auto_now_add=True)  # Kayit olusunca otomatik zaman.
     status = models.CharField(max_length=10, choices=StatusChoices.choices, default=StatusChoices.PENDING)  # Durum alani; choices ile sinirli.
+    updated_at = models.DateTimeField(auto_now=True)  # Order veya item'lari degisince guncellenir (signals.py).
+    # Denormalize toplamlar; OrderItem yazimlarinda refresh_totals() ile guncel tutulur.
+    # Neden: her okumada item'lardan toplam hesaplamamak; total_price'a gore filtre/siralama index kullansin.
+    total_price = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'), db_index=True)
+    item_count = models.PositiveIntegerField(default=0)  # Order'daki OrderItem satir sayisi.
 
     products = models.ManyToManyField(Product, through="OrderItem", related_name='orders')  # Quantity gibi ek alan icin ara tablo kullanilir.
 
-    # Admin/console'da okunabilir metin.
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        # OrderViewSet'in erisim yollari: normal user kendi order'lari (user_id = ..) + created_at filtresi,
+        # ?status= + created_at araligi, staff icin created_at araligi / ?ordering=created_at.
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='order_user_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='order_status_created_idx'),
+            models.Index(fields=['created_at'], name='order_created_idx'),
+        ]
+
+    # Ucuz versiyon token'i (pk + updated_at); ETag olarak kullanilir.
+    @property
+    def version_token(self):
+        return f'{self.pk}-{self.updated_at.timestamp():.6f}'
+
+    # Admin/console'da okunabilir metin; listelerde user select_related ile gelmeli (admin.py).
     def __str__(self):
         return f"Order {self.order_id} by {self.user.username}"
 
 
+# OrderItem QuerySet'i: signal gondermeyen toplu islemlerde de parent order toplamlarini gunceller.
+# Neden: bulk_create/update/delete post_save/post_delete tetiklemez (signals.py sadece tekil yazimlari yakalar).
+class OrderItemQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        refresh_order_totals({obj.order_id for obj in objs}, sales=True)
+        return objs
+
+    def update(self, **kwargs):
+        order_ids = set(self.values_list('order_id', flat=True))  # Guncellemeden once: satir baska order'a tasinabilir.
+        rows = super().update(**kwargs)
+        if 'order' in kwargs or 'order_id' in kwargs:
+            order = kwargs.get('order', kwargs.get('order_id'))
+            order_ids.add(getattr(order, 'pk', order))
+        refresh_order_totals(order_ids, sales=True)
+        return rows
+
+    def delete(self):
+        order_ids = set(self.values_list('order_id', flat=True))
+        result = super().delete()
+        refresh_order_totals(order_ids, sales=True)
+        return result
+
+
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')  # order.items ile erisim; siparis silinirse item'lar silinir.
     product = models.ForeignKey(Product, on_delete=models.CASCADE)  # Siparisteki urun; urun silinirse item da silinir.
     quantity = models.PositiveIntegerField()  # Siparis adedi; negatif olamaz.
 
+    objects = OrderItemQuerySet.as_manager()
+
     # DB'de alan degil; toplam satir tutarini hesaplar.
+    # QuerySet'te annotate(subtotal=...) yapildiysa DB'nin hesapladigi deger kullanilir.
     @property
     def item_subtotal(self):
+        subtotal = getattr(self, 'subtotal', None)
+        if subtotal is not None:
+            return subtotal
         return self.product.price * self.quantity
 
-    # Admin/console icin okunabilir metin.
+    # Admin/console icin okunabilir metin; order_id FK kolonundan okunur (Order sorgusu yok).
+    def __str__(self):
+        return f"{self.quantity} x {self.product.name} in Order {self.order_id}"
+
+
+# Gunluk satis rollup'lari: /analytics/sales bu tablolardan okur, istek aninda OrderItem taranmaz.
+# Veri gun bazinda bolumlenir: yazimlar etkilenen gunleri isaretler (schedule_sales_rollups), commit'ten sonra
+# her gunun satirlari bir kez silinip yeniden hesaplanir (refresh_sales_rollups).
+# Tutarlar Order.total_price gibi urunlerin guncel fiyatiyla hesaplanir.
+class DailySales(models.Model):
+    day = models.DateField()  # Order.created_at'in yerel (TIME_ZONE) tarihi.
+    status = models.CharField(max_length=10, choices=Order.StatusChoices.choices)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    units = models.PositiveBigIntegerField(default=0)  # Satilan toplam adet (OrderItem.quantity toplami).
+    orders = models.PositiveIntegerField(default=0)  # O gun olusturulan order sayisi (bos order'lar dahil).
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['day', 'status'], name='daily_sales_day_status_uniq')]
+
     def __str__(self):
-        return f"{self.quantity} x {self.product.name} in Order {self.order.order_id}"
+        return f"{self.day} {self.status}: {self.revenue}"
+
+
+# Gun + status + urun bazinda satis rollup'i.
+class DailyProductSales(models.Model):
+    day = models.DateField()
+    status = models.CharField(max_length=10, choices=Order.StatusChoices.choices)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='daily_sales')
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    units = models.PositiveBigIntegerField(default=0)
+    orders = models.PositiveIntegerField(default=0)  # Urunu iceren order sayisi.
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'status', 'product'], name='daily_product_sales_uniq'),
+        ]
+        indexes = [models.Index(fields=['product', 'day'], name='daily_product_sales_prod_idx')]  # ?product=.. filtresi icin.
+
+    def __str__(self):
+        return f"{self.day} {self.status} {self.product_id}: {self.revenue}"
+
+
+_deferred_sales_days = ContextVar('deferred_sales_days', default=None)
+_pending_sales = threading.local()  # Commit bekleyen gunler (thread basina; signal'lar istegin thread'inde calisir).
+
+
+# Blok icindeki rollup isaretlerini biriktirir ve blok sonunda tek seferde isaretler.
+# Neden: toplu yuklemelerde (populate_db, /orders/bulk/) ayni gun her batch'te tekrar toplanmasin.
+@contextmanager
+def defer_sales_rollups():
+    days = set()
+    token = _deferred_sales_days.set(days)
+    try:
+        yield
+    finally:
+        _deferred_sales_days.reset(token)
+    schedule_sales_rollups(days)
+
+
+# Gunlerin rollup'larini commit'ten sonra arka planda (tasks.py) yeniler; ayni transaction'daki tum yazimlar
+# tek yenilemede birlesir. Neden: her OrderItem yazimi o gunun tum satislarini istek icinde yeniden toplamasin
+# ve rollup satirlarini transaction boyunca kilitli tutmasin. Geri alinan transaction'in gunleri bir
+# sonraki commit'te (gereksiz ama zararsiz bicimde) yeniden hesaplanir.
+def schedule_sales_rollups(days):
+    days = set(days)
+    if not days:
+        return
+    deferred = _deferred_sales_days.get()
+    if deferred is not None:
+        deferred.update(days)
+        return
+    pending = getattr(_pending_sales, 'days', None)
+    if pending is None:
+        pending = _pending_sales.days = set()
+    pending.update(days)
+    transaction.on_commit(_flush_sales_rollups)  # Ilk callback tum gunleri alir, sonrakiler bos set gorur.
+
+
+def _flush_sales_rollups():
+    days = getattr(_pending_sales, 'days', None)
+    if days:
+        _pending_sales.days = set()
+        submit(refresh_sales_rollups, days)
+
+
+# Verilen gunlere ait order'lari secen filtre; TruncDate yerine created_at araligi (index kullanilabilsin).
+def created_on_days(days, prefix=''):
+    condition = Q()
+    for day in days:
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        condition |= Q(**{f'{prefix}created_at__gte': start, f'{prefix}created_at__lt': start + timedelta(days=1)})
+    return condition
+
+
+# Verilen gunlerin rollup satirlarini Order/OrderItem'dan hesaplar (kaydetmeden).
+def compute_sales_rollups(days):
+    days = sorted(set(days))
+    if not days:
+        return [], []
+
+    product_rows = [
+        DailyProductSales(day=row['day'], status=row['status'], product_id=row['product'],
+                          revenue=row['revenue'], units=row['units'], orders=row['orders'])
+        for row in OrderItem.objects.filter(created_on_days(days, 'order__'))
+        .values('product', day=TruncDate('order__created_at'), status=F('order__status'))
+        .annotate(
+            revenue=Sum(ExpressionWrapper(F('quantity') * F('product__price'),
+                                          output_field=models.DecimalField(max_digits=14, decimal_places=2))),
+            units=Sum('quantity'),
+            orders=Count('order', distinct=True),
+        )
+        .order_by()
+    ]
+    units = Counter()
+    for row in product_rows:
+        units[row.day, row.status] += row.units
+
+    day_rows = [
+        DailySales(day=row['day'], status=row['status'], revenue=row['revenue'],
+                   units=units[row['day'], row['status']], orders=row['orders'])
+        for row in Order.objects.filter(created_on_days(days))
+        .values('status', day=TruncDate('created_at'))
+        .annotate(revenue=Sum('total_price'), orders=Count('pk'))
+        .order_by()
+    ]
+    return day_rows, product_rows
+
+
+# Gunlerin rollup satirlarini tek transaction'da siler ve yeniden yazar.
+# Order ve OrderItem'in yazim yollari (signals.py, OrderQuerySet, OrderItemQuerySet) buraya commit'ten sonra
+# schedule_sales_rollups uzerinden ulasir; rebuild_sales_rollups dogrudan cagirir.
+def refresh_sales_rollups(days):
+    days = set(days)
+    if not days:
+        return
+
+    with transaction.atomic():
+        day_rows, product_rows = compute_sales_rollups(days)
+        DailySales.objects.filter(day__in=days).delete()
+        DailyProductSales.objects.filter(day__in=days).delete()
+        DailySales.objects.bulk_create(day_rows)
+        DailyProductSales.objects.bulk_create(product_rows, batch_size=1000)
+    bump_version(DailySales)  # /analytics/sales response cache'i.
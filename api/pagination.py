@@ -0,0 +1,144 @@
+import json
+from base64 import b64decode, b64encode
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+# pagination.py: view'lere ozel pagination siniflari.
+# Neden: settings.py'deki global PAGE_SIZE'i bozmadan endpoint bazli limit vermek.
+
+
+# /products/info icin limit/offset pagination.
+# Neden: butun katalogu tek response'ta tutmamak; count zaten aggregate ile geliyor.
+class ProductInfoPagination(LimitOffsetPagination):
+    default_limit = 100  # ?limit verilmezse sayfa basina urun sayisi.
+    max_limit = 1000  # Istemci bundan buyuk limit isteyemez.
+
+
+# Keyset (cursor) pagination: "WHERE (alan, pk) > (son_deger, son_pk) ORDER BY alan, pk LIMIT n".
+# Neden: OFFSET derin sayfalarda satirlari tarayip atar; keyset'te N. sayfa 1. sayfa kadar ucuzdur.
+# ?ordering= ile secilen alan (view.ordering_fields icinden) + pk tiebreaker kullanilir;
+# COUNT(*) varsayilan olarak calismaz, sadece ?with_count=1 ile eklenir.
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'  # ?cursor=<opaque token>
+    page_size_query_param = 'limit'  # ?limit=.. ile sayfa boyutu.
+    count_query_param = 'with_count'  # ?with_count=1 ise toplam adet de doner.
+    ordering_param = api_settings.ORDERING_PARAM  # OrderingFilter ile ayni param (?ordering=-price).
+    page_size = api_settings.PAGE_SIZE  # settings.py'deki PAGE_SIZE.
+    max_page_size = 1000
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(request, view)
+        cursor = self.decode_cursor(request, queryset.model)
+        self.count = queryset.count() if request.query_params.get(self.count_query_param) in ('1', 'true') else None
+
+        reverse = cursor is not None and cursor['r']  # previous linki ile gelindiyse ters yonde taranir.
+        descending = self.descending != reverse
+        queryset = queryset.order_by(*self.ordering_fields(descending))
+        if cursor is not None:
+            queryset = queryset.filter(self.seek_filter(cursor, descending))
+
+        rows = list(queryset[:self.page_size + 1])  # +1 satir: sonraki sayfa var mi anlamak icin.
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        response = {'next': self.get_next_link(), 'previous': self.get_previous_link(), 'results': data}
+        if self.count is not None:
+            response = {'count': self.count, **response}
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(request.query_params[self.page_size_query_param], strict=True, cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    # ?ordering=-price -> ('price', True). Whitelist disindaki alanlar icin pk kullanilir.
+    def get_ordering(self, request, view):
+        allowed = getattr(view, 'ordering_fields', None) or []
+        ordering = request.query_params.get(self.ordering_param, '').split(',')[0].strip()
+        field = ordering.lstrip('-')
+        if field in allowed:
+            return field, ordering.startswith('-')
+        return 'pk', ordering == '-pk'
+
+    def ordering_fields(self, descending):
+        prefix = '-' if descending else ''
+        if self.field == 'pk':
+            return (f'{prefix}pk',)
+        return (f'{prefix}{self.field}', f'{prefix}pk')
+
+    # (alan, pk) > (deger, pk) kosulunu OR ile yazar; composite index bu kosulu kullanabilir.
+    def seek_filter(self, cursor, descending):
+        lookup = 'lt' if descending else 'gt'
+        if self.field == 'pk':
+            return Q(**{f'pk__{lookup}': cursor['p']})
+        return Q(**{f'{self.field}__{lookup}': cursor['v']}) | Q(**{self.field: cursor['v'], f'pk__{lookup}': cursor['p']})
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    # Cursor: son satirin (alan degeri, pk, yon) bilgisi; base64 ile opak hale getirilir.
+    def encode_cursor(self, row, reverse):
+        value = None if self.field == 'pk' else str(getattr(row, self.field))
+        token = json.dumps({'v': value, 'p': row.pk, 'r': int(reverse)}, separators=(',', ':'))
+        encoded = b64encode(token.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    # Bozuk/elle degistirilmis cursor 500 yerine 404 dondurur.
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            value = None if self.field == 'pk' else self.clean_value(model._meta.get_field(self.field), cursor['v'])
+            return {'v': value, 'p': self.clean_value(model._meta.pk, cursor['p']), 'r': bool(cursor['r'])}
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    # Cursor degeri alanin tipine ve validator'larina (max_digits, DB integer araligi) uymali.
+    # Neden: None "price > NULL" filtresi kuramaz (ValueError), asiri buyuk sayilar DB driver'inda
+    # OverflowError verir; ikisi de 500 olurdu. Sonsuz decimal'leri to_python zaten reddeder.
+    @staticmethod
+    def clean_value(field, value):
+        value = field.to_python(value)
+        if value is None:
+            raise ValidationError('Cursor value is required')
+        field.run_validators(value)
+        return value
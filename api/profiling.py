@@ -0,0 +1,90 @@
+import random
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+# profiling.py: Silk'in hangi istekleri kaydedecegine karar veren SILKY_INTERCEPT_FUNC (settings.py).
+# Neden: SilkyMiddleware her istekte request kaydi + tum SQL sorgularini DB'ye yaziyordu; hot
+# endpoint'lerde DB yazimlarini ikiye katliyor. Sadece ornekleme ile secilen istekler, include/exclude
+# kurallarina uyan path'ler ve header ile isteyen staff kullanicilarin istekleri kaydedilir.
+# Ayarlar: settings.SILK_PROFILING (SAMPLE_RATE, INCLUDE_PATHS, EXCLUDE_PATHS, STAFF_HEADER, ASYNC_PATHS).
+
+
+def profiling_settings():
+    return {
+        'SAMPLE_RATE': 1.0,
+        'INCLUDE_PATHS': (),  # Bos ise tum path'ler; doluysa sadece bu prefix'lerle baslayanlar orneklenir.
+        'EXCLUDE_PATHS': (),  # Bu prefix'lerle baslayan path'ler hic kaydedilmez (header ile bile).
+        'STAFF_HEADER': 'X-Silk-Profile',
+        'ASYNC_PATHS': (),  # Bu prefix'lerle baslayan istekler Silk'e hic girmez (ProfilingMiddleware).
+        **getattr(settings, 'SILK_PROFILING', {}),
+    }
+
+
+# True donerse istek Silk ile kaydedilir.
+def should_profile_request(request):
+    config = profiling_settings()
+    path = request.path
+    if path.startswith(tuple(config['EXCLUDE_PATHS'])):
+        return False
+    if config['STAFF_HEADER'] and request.headers.get(config['STAFF_HEADER']) in ('1', 'true') and is_staff(request):
+        return True  # Staff kullanici istegi header ile profil ettirebilir (ornekleme ve include disi).
+    if config['INCLUDE_PATHS'] and not path.startswith(tuple(config['INCLUDE_PATHS'])):
+        return False
+    return random.random() < config['SAMPLE_RATE']
+
+
+# Session (AuthenticationMiddleware) ya da JWT (Authorization header) ile gelen kullanici staff mi?
+# JWT sadece header varken dogrulanir; DRF auth'u view'de calistigi icin middleware'de request.user anonimdir.
+def is_staff(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+    from api.authentication import CachedJWTAuthentication  # settings.py bu modulu import eder; app registry henuz hazir degil.
+    from rest_framework.exceptions import AuthenticationFailed
+    try:
+        result = CachedJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:  # InvalidToken da AuthenticationFailed'in alt sinifidir.
+        return False
+    return result is not None and result[0].is_staff
+
+
+# SilkyMiddleware'i saran middleware (settings.MIDDLEWARE): SILK_PROFILING['ASYNC_PATHS'] altindaki istekler
+# Silk'e hic girmez. Neden: SilkyMiddleware sync-only; zincirde durdugu icin ASGI altinda her istek
+# (async view'ler dahil, api/async_views.py) thread'e geciyordu. Bu middleware sync ve async calisabilir;
+# diger istekler icin Silk, Django'nun sync-only middleware'leri adapte ettigi gibi thread'de calisir.
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        from silk.middleware import SilkyMiddleware  # silk.models settings ister; settings.py bu modulu import eder.
+        self.get_response = get_response
+        self.async_paths = tuple(profiling_settings()['ASYNC_PATHS'])
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            self.silk = SilkyMiddleware(async_to_sync(get_response))
+            self.profile_async = sync_to_async(self.profile)
+        else:
+            self.silk = SilkyMiddleware(get_response)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.path.startswith(self.async_paths):
+            return self.get_response(request)
+        return self.profile(request)
+
+    async def __acall__(self, request):
+        if request.path.startswith(self.async_paths):
+            return await self.get_response(request)
+        return await self.profile_async(request)
+
+    # Silk'in thread'e bagli DataCollector'i istek bitince bosaltilir: Silk'e girmeyen istekler ayni
+    # thread'de sorgu calistirdiginda onceki kaydin istegine yazilmasin (Silk sadece istek basinda temizler).
+    def profile(self, request):
+        from silk.collector import DataCollector
+        try:
+            return self.silk(request)
+        finally:
+            DataCollector().clear()
@@ -0,0 +1,65 @@
+import decimal
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson opsiyonel; yoksa ORJSONRenderer DRF'in JSONRenderer'i gibi calisir.
+    orjson = None
+
+# renderers.py: DRF'in hazir renderer'larina ek olarak kullandigimiz renderer'lar.
+# Neden: response formatini view'e gore degistirebilmek (Accept header veya ?format=).
+
+
+# JSONRenderer ile ayni byte'lari ureten, orjson (Rust) tabanli varsayilan renderer (settings.py).
+# Neden: Decimal/UUID/datetime dolu payload'larda stdlib json + JSONEncoder.default render suresinin
+# buyuk kismini aliyordu.
+# Ayni cikti icin: datetime/date/time orjson'a birakilmaz (OPT_PASSTHROUGH_DATETIME), DRF'in encoder'i
+# formatlar ('Z' soneki dahil); UUID'ler orjson'da da str(uuid) ile ayni yazilir; U+2028/U+2029 kacirilir.
+# Geri dusme: indent istenirse, UNICODE_JSON/COMPACT_JSON kapaliysa, orjson'un yazamadigi bir deger
+# (64 bit'i asan int, str olmayan key) veya float'a cevrilince us (1e+16) notasyonuyla yazilacak
+# bir Decimal varsa cikti JSONRenderer ile uretilir.
+# Not: serializer'larin urettigi float'lar (FloatField) orjson ile yazilir; sadece |x| >= 1e16 veya
+# < 1e-4 icin us formati farklidir (1e16 / 1e+16), bu API'nin alanlarinda boyle deger yok.
+class ORJSONRenderer(JSONRenderer):
+    options = orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or orjson is None or self.ensure_ascii or not self.compact \
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            encoder = self.encoder_class()
+            ret = orjson.dumps(data, default=lambda obj: self.default(obj, encoder), option=self.options)
+        except TypeError:  # orjson.JSONEncodeError, TypeError'in alt sinifidir.
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+    # orjson'un dogrudan yazamadigi tipler icin DRF'in JSONEncoder.default'u kullanilir.
+    def default(self, obj, encoder):
+        if isinstance(obj, decimal.Decimal):
+            value = float(obj)
+            if value and not 1e-4 <= abs(value) < 1e16:
+                raise TypeError('float exponent formatting differs from json.dumps')
+            return value
+        return encoder.default(obj)
+
+
+# Newline-delimited JSON: her kayit tek satirlik bir JSON objesi.
+# Neden: buyuk listeleri parca parca (stream) gondermek; istemci satir satir okuyabilir.
+class NDJSONRenderer(ORJSONRenderer):
+    media_type = 'application/x-ndjson'  # Accept: application/x-ndjson ile secilir.
+    format = 'ndjson'  # ?format=ndjson ile de secilebilir.
+
+    # Liste ise her eleman ayri satir, tek obje ise tek satir yazilir.
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return b''.join(self.render_row(row) for row in rows)
+
+    # Tek kaydi kompakt JSON + '\n' olarak dondurur (stream icin tek tek cagrilir).
+    def render_row(self, row):
+        return super().render(row) + b'\n'
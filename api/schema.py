@@ -0,0 +1,98 @@
+import gzip
+import hashlib
+import re
+import threading
+from pathlib import Path
+
+import yaml
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from drf_spectacular.drainage import GENERATOR_STATS
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+from api.conditional import not_modified_response
+
+# schema.py: /api/schema/ icin on-uretilmis (static) OpenAPI schema'si.
+# Neden: SpectacularAPIView her istekte tum view ve serializer'lari introspect ediyordu; Swagger UI / Redoc
+# her sayfa yuklemesinde, SDK generator'lari da polling ile bu endpoint'i cagiriyor.
+# Schema deploy sirasinda `manage.py build_schema` ile settings.API_SCHEMA_FILE'a yazilir. Her process ilk istekte
+# dosyayi bir kez okur; YAML/JSON halleri, gzip'li kopyalari ve ETag'leri bellekte tutulur (dosya yoksa bir kez uretilir).
+# `manage.py build_schema --check` kodla dosya farkliysa hata verir (CI / tests.py).
+
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')  # django.middleware.gzip ile ayni kontrol.
+
+
+# Kod uzerinden schema dict'i (manage.py spectacular ile ayni: request'siz, public).
+# Uyarilar susturulur; detaylari icin: python manage.py spectacular --file /dev/null
+def generate_schema():
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    with GENERATOR_STATS.silence():
+        return generator.get_schema(request=None, public=True)
+
+
+# API_SCHEMA_FILE'a yazilan YAML (manage.py spectacular ciktisiyla byte byte ayni).
+def render_schema(schema):
+    return OpenApiYamlRenderer().render(schema, renderer_context={})
+
+
+# Tek bir format icin hazir response govdeleri; ETag icerikten (sha256) gelir.
+class SchemaVariant:
+    def __init__(self, media_type, content):
+        self.media_type = media_type
+        self.content = content
+        self.gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+        self.etag = f'W/"{hashlib.sha256(content).hexdigest()[:32]}"'  # Weak: gzip'li ve duz hali ayni ETag'i paylasir.
+
+
+class SchemaDocument:
+    def __init__(self, content):
+        schema = yaml.safe_load(content)
+        self.yaml = SchemaVariant(OpenApiYamlRenderer.media_type, content)
+        self.json = SchemaVariant(OpenApiJsonRenderer.media_type, OpenApiJsonRenderer().render(schema, renderer_context={}))
+
+
+_document = None
+_lock = threading.Lock()
+
+
+def get_document():
+    global _document
+    if _document is None:
+        with _lock:
+            if _document is None:
+                path = Path(settings.API_SCHEMA_FILE)
+                content = path.read_bytes() if path.exists() else render_schema(generate_schema())
+                _document = SchemaDocument(content)
+    return _document
+
+
+# build_schema dosyayi yeniden yazinca (veya testlerde) bellekteki kopyayi birakir.
+def reset_document():
+    global _document
+    _document = None
+
+
+# ?format=json veya Accept: ...json -> JSON; aksi halde YAML (SpectacularAPIView ile ayni).
+def wants_json(request):
+    if request.GET.get('format') in ('json', 'openapi-json'):
+        return True
+    return 'json' in request.headers.get('Accept', '')
+
+
+# GET /api/schema/: DRF disi; bellekteki hazir byte'lar doner, If-None-Match eslesirse 304.
+def schema_view(request):
+    document = get_document()
+    variant = document.json if wants_json(request) else document.yaml
+    response = not_modified_response(request, etag=variant.etag)
+    if response is None:
+        if ACCEPTS_GZIP.search(request.headers.get('Accept-Encoding', '')):
+            response = HttpResponse(variant.gzipped, content_type=variant.media_type)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(variant.content, content_type=variant.media_type)
+    response['ETag'] = variant.etag
+    response['Cache-Control'] = 'no-cache'  # Istemci cache'ler ama her seferinde ETag ile dogrular (deploy'da degisir).
+    patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+    return response
@@ -0,0 +1,127 @@
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+# search.py: Product icin full-text search backend'leri.
+# Neden: SearchFilter'in "description LIKE '%kelime%'" sorgusu her aramada tum tabloyu tarar;
+# FTS index'i ile arama katalog buyudukce lineer yavaslamaz ve sonuclar alaka skoruna gore siralanir.
+# Index DB tarafinda trigger/generated column ile tutulur; save(), bulk_create() ve admin hepsi senkron kalir.
+
+
+# SQLite: FTS5 external-content tablosu + insert/update/delete trigger'lari.
+class SQLiteFTS5Backend:
+    table = 'api_product_fts'
+    triggers = ('api_product_fts_ai', 'api_product_fts_ad', 'api_product_fts_au')
+
+    def __init__(self, model):
+        self.source = model._meta.db_table
+
+    # Idempotent kurulum; trigger'lar eksikse (orn. migration tabloyu yeniden olusturduysa) index yeniden doldurulur.
+    def install(self, cursor):
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)", self.triggers,
+        )
+        if cursor.fetchone()[0] == len(self.triggers):
+            return
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+            f"name, description, content='{self.source}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {self.triggers[0]} AFTER INSERT ON {self.source} BEGIN "
+            f"INSERT INTO {self.table}(rowid, name, description) VALUES (new.id, new.name, new.description); END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {self.triggers[1]} AFTER DELETE ON {self.source} BEGIN "
+            f"INSERT INTO {self.table}({self.table}, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {self.triggers[2]} AFTER UPDATE ON {self.source} BEGIN "
+            f"INSERT INTO {self.table}({self.table}, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); "
+            f"INSERT INTO {self.table}(rowid, name, description) VALUES (new.id, new.name, new.description); END"
+        )
+        cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+
+    # Her terim tirnak icine alinir (FTS5 operatorleri kullanicidan gelmesin) ve prefix (*) aramasi yapilir.
+    def match_expression(self, terms):
+        return ' '.join('"%s"*' % term.replace('"', '""') for term in terms)
+
+    # bm25: dusuk skor daha alakali; bu yuzden artan sirada siralanir.
+    def search(self, queryset, terms):
+        match = self.match_expression(terms)
+        rank = RawSQL(
+            f"SELECT bm25({self.table}) FROM {self.table} WHERE {self.table} MATCH %s AND {self.table}.rowid = {self.source}.id",
+            (match,),
+        )
+        return queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", (match,)),
+        ).annotate(search_rank=rank).order_by('search_rank', 'pk')
+
+
+# PostgreSQL: GENERATED tsvector kolonu + GIN index.
+class PostgresFullTextBackend:
+    column = 'search_vector'
+    config = 'english'
+
+    def __init__(self, model):
+        self.source = model._meta.db_table
+
+    def install(self, cursor):
+        cursor.execute(
+            f"ALTER TABLE {self.source} ADD COLUMN IF NOT EXISTS {self.column} tsvector GENERATED ALWAYS AS ("
+            f"setweight(to_tsvector('{self.config}', coalesce(name, '')), 'A') || "
+            f"setweight(to_tsvector('{self.config}', coalesce(description, '')), 'B')) STORED"
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.source}_search_vector_gin ON {self.source} USING GIN ({self.column})"
+        )
+
+    # Her terim tsquery icinde tirnaklanir ('terim':*) ve AND ile baglanir; prefix aramasi yapilir.
+    def tsquery(self, terms):
+        return ' & '.join("'%s':*" % term.replace('\\', '\\\\').replace("'", "''") for term in terms)
+
+    # ts_rank: yuksek skor daha alakali; bu yuzden azalan sirada siralanir.
+    def search(self, queryset, terms):
+        query = self.tsquery(terms)
+        tsquery = f"to_tsquery('{self.config}', %s)"
+        rank = RawSQL(f"ts_rank({self.source}.{self.column}, {tsquery})", (query,))
+        return queryset.filter(
+            pk__in=RawSQL(f"SELECT id FROM {self.source} WHERE {self.column} @@ {tsquery}", (query,)),
+        ).annotate(search_rank=rank).order_by('-search_rank', 'pk')
+
+
+SEARCH_BACKENDS = {
+    'sqlite': SQLiteFTS5Backend,
+    'postgresql': PostgresFullTextBackend,
+}
+
+
+# DB engine'e gore backend secer; desteklenmeyen engine'de None doner (SearchFilter'a geri duser).
+def get_search_backend(model, using='default'):
+    backend_class = SEARCH_BACKENDS.get(connections[using].vendor)
+    return backend_class(model) if backend_class else None
+
+
+# FTS tablosu/kolonu ve trigger'lar yoksa olusturur.
+def install_search_index(model, using='default'):
+    backend = get_search_backend(model, using)
+    if backend is not None:
+        with connections[using].cursor() as cursor:
+            backend.install(cursor)
+
+
+# post_migrate handler'i (apps.py); her migrate sonrasi index'in yerinde oldugunu garanti eder.
+# Neden: SQLite migration'lari tabloyu yeniden olusturunca trigger'lar silinir.
+def install_search_index_after_migrate(sender, using='default', **kwargs):
+    install_search_index(sender.get_model('Product'), using)
+
+
+# SearchFilter yerine gecer: ?search=.. FTS index'i uzerinden aranir ve alaka skoruna gore siralanir.
+# FTS destegi olmayan DB'de view'in search_fields'i ile normal SearchFilter davranisi kullanilir.
+class FullTextSearchFilter(filters.SearchFilter):
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        backend = get_search_backend(queryset.model, queryset.db)
+        if not terms or backend is None:
+            return super().filter_queryset(request, queryset, view)
+        return backend.search(queryset, terms)
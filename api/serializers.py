@@ -1,12 +1,39 @@
+import decimal
+from collections import Counter
+from functools import cached_property
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Product, Order, OrderItem
+from rest_framework.settings import api_settings
+
+from .cache import bump_version
+from .images import product_image_storage
+from .models import Product, Order, OrderItem, defer_sales_rollups
 
 # serializers.py: API payload'larini Python objelerine cevirir ve validation yapar.
 # Neden: request/response formatini tek yerde kontrol etmek.
 
+MAX_ID = 2 ** 63 - 1  # BigAutoField ust siniri; daha buyuk id'ler DB driver'inda OverflowError (500) verir.
+
+
+# Product.image_renditions -> {"160": "/media/renditions/.../160.webp", ...} (genislik -> URL).
+# Rendition'lar henuz uretilmediyse (veya gorsel yoksa) bos dict.
+class RenditionsField(serializers.Field):
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        storage = product_image_storage()
+        return {width: storage.url(path) for width, path in value.get('sizes', {}).items()}
+
 
 # Product modeli icin serializer (read/write).
 class ProductSerializer(serializers.ModelSerializer):
+    renditions = RenditionsField(source='image_renditions')  # Kucuk boyutlu WebP gorseller (images.py).
+
     class Meta:
         model = Product  # Hangi modelin alanlari kullanilacak.
         fields = (  # API'de gosterilecek alanlar; ID DB'de uretildigi icin eklenmedi.
@@ -14,6 +41,7 @@ class ProductSerializer(serializers.ModelSerializer):
             'name',
             'price',
             'stock',
+            'renditions',
         )
 
     # price alanini dogrular; negatif/0 fiyatlari engeller.
@@ -25,6 +53,83 @@ class ProductSerializer(serializers.ModelSerializer):
         return value
 
 
+# Salt-okunur hizli yol: values_list() satirlarini bir serializer'in ciktisina birebir cevirir.
+# Neden: buyuk sayfalarda (/products/?limit=1000) her satir icin model instance + DRF'in alan basina
+# to_representation zinciri CPU'nun cogunu harciyor. Burada alan listesi ve donusturuculer bir kez
+# derlenir; CharField/IntegerField gibi DB'den zaten dogru tipte gelen alanlar hic donusturulmez.
+# Cikti ayni serializer'in many=True ciktisiyla ayni JSON'u uretir (alan sirasi dahil).
+class ValuesListSerializer:
+    passthrough_fields = (serializers.CharField, serializers.IntegerField, serializers.BooleanField)
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+
+    # Serializer alanlari ilk kullanimda derlenir (import aninda app registry hazir olmayabilir).
+    @cached_property
+    def compiled(self):
+        fields = [field for field in self.serializer_class().fields.values() if not field.write_only]
+        columns = [field.field_name for field in fields]
+        sources = [field.source.replace('.', '__') for field in fields]  # product.name -> product__name
+        converters = [
+            (index, converter) for index, converter in enumerate(map(self.compile_converter, fields))
+            if converter is not None
+        ]
+        return columns, sources, converters
+
+    @property
+    def columns(self):
+        return self.compiled[0]
+
+    # values_list(*sources) ile cekilecek kolonlar.
+    @property
+    def sources(self):
+        return self.compiled[1]
+
+    # Alan icin (deger -> JSON degeri) fonksiyonu; None donerse deger oldugu gibi kullanilir.
+    def compile_converter(self, field):
+        if type(field) in self.passthrough_fields:
+            return None
+        coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+        if isinstance(field, serializers.DecimalField) and coerce_to_string and not field.localize \
+                and not field.normalize_output and field.decimal_places is not None:
+            # DecimalField.to_representation ile ayni quantize + '{:f}' formati; Decimal disi degerler icin geri duser.
+            exponent = decimal.Decimal('.1') ** field.decimal_places
+            context = decimal.getcontext().copy()
+            if field.max_digits is not None:
+                context.prec = field.max_digits
+            rounding, fallback = field.rounding, field.to_representation
+
+            def convert_decimal(value):
+                if type(value) is not decimal.Decimal:
+                    return fallback(value)
+                return format(value.quantize(exponent, rounding=rounding, context=context), 'f')
+            return convert_decimal
+        return field.to_representation
+
+    # Satirlari serializer'in alan sirasiyla listelere cevirir; fazladan kolonlar (orn. pk) atilir.
+    def to_rows(self, rows):
+        width = len(self.columns)
+        converters = self.compiled[2]
+        result = []
+        for row in rows:
+            values = list(row[:width])
+            for index, convert in converters:
+                value = values[index]
+                if value is not None:  # Serializer None degerleri to_representation'a vermez.
+                    values[index] = convert(value)
+            result.append(values)
+        return result
+
+    # serializer_class(rows, many=True).data ile ayni liste (dict'ler).
+    def to_representation(self, rows):
+        columns = self.columns
+        return [dict(zip(columns, values)) for values in self.to_rows(rows)]
+
+    # Kolon bazli payload: {"columns": [...], "rows": [[...], ...]}; alan isimleri her satirda tekrarlanmaz.
+    def to_columns(self, rows):
+        return {'columns': self.columns, 'rows': self.to_rows(rows)}
+
+
 # OrderItem serializer: order icindeki her satiri (urun+adet) temsil eder.
 class OrderItemSerializer(serializers.ModelSerializer):
     # source=... ile Product uzerinden alan cekiyoruz; nested serializer yazmadan hafif cozum.
@@ -44,12 +149,11 @@ class OrderItemSerializer(serializers.ModelSerializer):
 # Order serializer: order + nested items + hesaplanan toplam fiyat.
 class OrderSerializer(serializers.ModelSerializer):
     items = OrderItemSerializer(many=True, read_only=True)  # related_name='items' uzerinden nested serializer.
-    total_price = serializers.SerializerMethodField(method_name='total')  # DB'de olmayan hesaplanan alan.
+    total_price = serializers.SerializerMethodField(method_name='total')  # Order.total_price kolonu (materialize toplam).
 
-    # total_price icin hesaplama fonksiyonu; neden: toplam fiyat DB'de tutulmaz.
+    # total_price: OrderItem yazimlarinda guncellenen kolon; okumada item'lar uzerinden hesaplama yapilmaz.
     def total(self, obj):
-        order_items = obj.items.all()  # OrderItem listesi (related_name='items').
-        return sum(order_item.item_subtotal for order_item in order_items)  # Her satirin subtotal'ini toplar.
+        return obj.total_price
 
     class Meta:
         model = Order  # Hangi model.
@@ -63,11 +167,89 @@ class OrderSerializer(serializers.ModelSerializer):
         )
 
 
+# Bulk order create icin tek satir: product id + adet.
+# Neden: PrimaryKeyRelatedField her satir icin ayri SELECT atar; id'ler create() icinde tek sorguda dogrulanir.
+class OrderItemCreateSerializer(serializers.Serializer):
+    product = serializers.IntegerField(min_value=1, max_value=MAX_ID)  # Product pk.
+    quantity = serializers.IntegerField(min_value=1)  # Siparis adedi.
+
+
+# Bulk order create icin tek order: durum + satirlari.
+class OrderCreateSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Order.StatusChoices.choices, default=Order.StatusChoices.PENDING)
+    items = OrderItemCreateSerializer(many=True, allow_empty=False)
+
+
+# /orders/bulk/: tek istekte cok sayida order + item olusturur.
+# Hepsi tek transaction'da: etkilenen Product satirlari select_for_update ile kilitlenir,
+# stok yetmezse hicbir sey yazilmaz; yeterliyse order/item'lar bulk_create ile yazilir
+# ve her product icin stok tek bir F() UPDATE'i ile dusurulur.
+class BulkOrderCreateSerializer(serializers.Serializer):
+    orders = OrderCreateSerializer(many=True, allow_empty=False, max_length=1000)  # Istek basina order limiti.
+
+    def create(self, validated_data):
+        user = self.context['request'].user
+        quantities = Counter()  # product id -> toplam istenen adet.
+        for order_data in validated_data['orders']:
+            for item in order_data['items']:
+                quantities[item['product']] += item['quantity']
+
+        with transaction.atomic(), defer_sales_rollups():  # Satis rollup'i batch'ler yerine bir kez hesaplanir.
+            # pk sirasiyla kilitlenir; ayni anda calisan bulk istekleri deadlock'a girmesin.
+            products = {
+                product.pk: product
+                for product in Product.objects.select_for_update().filter(pk__in=quantities).order_by('pk').only('pk', 'name', 'stock')
+            }
+            missing = sorted(set(quantities) - set(products))
+            if missing:
+                raise serializers.ValidationError({'orders': f'Products not found: {missing}'})
+            short = [products[pk].name for pk, quantity in quantities.items() if products[pk].stock < quantity]
+            if short:
+                raise serializers.ValidationError({'orders': f'Insufficient stock for: {", ".join(short)}'})
+
+            orders, items = [], []
+            for order_data in validated_data['orders']:
+                order = Order(user=user, status=order_data['status'])  # order_id (UUID) Python'da uretilir; bulk_create sonrasi hazir.
+                orders.append(order)
+                items += [OrderItem(order=order, product_id=item['product'], quantity=item['quantity']) for item in order_data['items']]
+            Order.objects.bulk_create(orders)
+            OrderItem.objects.bulk_create(items, batch_size=1000)
+
+            now = timezone.now()
+            for pk, quantity in quantities.items():
+                Product.objects.filter(pk=pk).update(stock=F('stock') - quantity, updated_at=now)
+            bump_version(Product)  # QuerySet.update() signal gondermez; product response cache'ini elle gecersiz kil.
+        return orders
+
+
+# /products/batch girdisi: product id listesi (istek basina en fazla max_length id).
+class ProductBatchSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1, max_value=MAX_ID), allow_empty=False, max_length=100)
+
+
 # Custom/standart olmayan response icin plain Serializer.
 class ProductInfoSerializer(serializers.Serializer):
-    products = ProductSerializer(many=True)  # QuerySet'i nested list olarak doner.
+    products = ProductSerializer(many=True)  # Sayfalanmis QuerySet'i nested list olarak doner.
     count = serializers.IntegerField()  # Toplam adet.
     max_price = serializers.FloatField()  # En yuksek fiyat.
+    next = serializers.CharField(allow_null=True)  # Sonraki sayfanin URL'i (yoksa null).
+    previous = serializers.CharField(allow_null=True)  # Onceki sayfanin URL'i (yoksa null).
+
+
+# /analytics/sales satirlari (rollup tablolarindan values() ile gelen dict'ler).
+class SalesSerializer(serializers.Serializer):
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)  # Ciro.
+    units = serializers.IntegerField()  # Satilan adet.
+    orders = serializers.IntegerField()  # Order sayisi.
+
+
+class DailySalesSerializer(SalesSerializer):
+    day = serializers.DateField()
+
+
+class ProductSalesSerializer(SalesSerializer):
+    product = serializers.IntegerField()  # Product pk.
+    product_name = serializers.CharField()
 
 
 # =====================================================
@@ -87,3 +269,4 @@ class ProductInfoSerializer(serializers.Serializer):
 # Bakim kolayligi    | Dusuk                       | Yuksek
 # Kullanim alani     | Ozet / Istatistik / Custom  | Standart REST API
 # =====================================================
+
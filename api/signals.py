@@ -0,0 +1,83 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from api.authentication import user_cache
+from api.cache import bump_version
+from api.images import schedule_product_image
+from api.tasks import run_after_commit
+from api.models import (Order, OrderItem, Product, User, refresh_orders_of_product, schedule_order_totals,
+                        schedule_sales_rollups)
+
+# signals.py: model yazimlarina bagli yan etkiler.
+# Neden: admin, API ve shell'den yapilan her degisiklikte ayni kod calissin.
+
+
+# Product eklenince/guncellenince/silinince response cache versiyonu artar.
+# Not: bulk_create() ve QuerySet.update() signal gondermez; oralarda bump_version(Product) elle cagrilir.
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_cache(sender, **kwargs):
+    bump_version(Product)
+
+
+# Product'in name/price'i degisince onu iceren order'larin toplamlari (fiyat) ve updated_at'i yenilenir.
+# Neden: order response'u product_name/product_price icerir; eski ETag/Last-Modified ile 304 donmesin.
+# Order sayisi sinirsiz olabilir: is commit'ten sonra arka planda calisir (tasks.py); stok gibi
+# order'larda gorunmeyen alanlarin degisimi (ve degeri degismeyen kayitlar) order'lara dokunmaz.
+@receiver(post_save, sender=Product)
+def refresh_orders_of_changed_product(sender, instance, created, update_fields=None, **kwargs):
+    if not created and instance.order_fields_changed(update_fields):
+        run_after_commit(refresh_orders_of_product, instance.pk)
+    instance.remember_order_fields()
+
+
+# Gorsel degisti veya silindiyse eski gorselin rendition'lari birakilir (yeni dosyanin adi henuz belli degil).
+@receiver(pre_save, sender=Product)
+def clear_stale_renditions(sender, instance, **kwargs):
+    if instance.image_renditions and instance.image_renditions.get('image') != (instance.image.name or None):
+        instance.image_renditions = {}
+
+
+# Yeni gorselin rendition'lari commit'ten sonra arka planda uretilir (images.py); kayit istegi beklemez.
+@receiver(post_save, sender=Product)
+def render_product_image(sender, instance, **kwargs):
+    if instance.image and instance.image_renditions.get('image') != instance.image.name:
+        schedule_product_image(instance)
+
+
+# OrderItem eklenince/guncellenince/silinince parent order'in total_price, item_count ve updated_at'i
+# commit'te yenilenir (admin inline'lari dahil); transaction'daki tum item'lar icin order basina tek UPDATE,
+# rollup gunleri order id'lerinden okunur (schedule_order_totals). Toplu islemler OrderItemQuerySet'te ele alinir.
+# Order'in kendisi silinirken (cascade) silinecek order'in toplami yenilenmez.
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def refresh_parent_order(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Order) and origin.pk == instance.order_id:
+        return
+    if isinstance(origin, QuerySet) and origin.model is Order:
+        return
+    schedule_order_totals([instance.order_id])
+
+
+# Order yazilinca veya silinince Order'in son yazim zamani ilerler (/orders/ listesinin Last-Modified'i).
+# Toplu yazimlar (OrderQuerySet.update/bulk_create, item yazimlarinin refresh_totals'i) bunu kendileri yapar.
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_order_lists(sender, **kwargs):
+    bump_version(Order)
+
+
+# Order olusturulunca, status'u degisince veya silinince o gunun satis rollup'i commit'ten sonra yeniden hesaplanir.
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def refresh_order_day_sales(sender, instance, **kwargs):
+    schedule_sales_rollups([timezone.localdate(instance.created_at)])
+
+
+# User kaydedilince (is_active/is_staff/sifre degisikligi dahil) veya silinince JWT user cache'inden duser.
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
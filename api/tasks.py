@@ -0,0 +1,60 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+
+# tasks.py: istek disinda, commit'ten sonra arka plan thread'inde calisan isler.
+# Neden: bir yazimin yan etkisi cok sayida satiri guncelleyebiliyor (orn. product fiyat/isim degisince onu
+# iceren tum order'lar); bu is istek suresine eklenmesin ve istegin transaction'ini uzatmasin.
+# settings.API_TASK_WORKERS = 0 ise is commit'ten sonra ayni thread'de (senkron) calisir.
+# Isler process icinde tutulur: process dururken kuyrukta kalanlar kaybolur, bu yuzden her is
+# tekrar calistirilabilir olmali ve bir rebuild komutu ile (rebuild_order_totals vb.) telafi edilebilmeli.
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=settings.API_TASK_WORKERS, thread_name_prefix='api-tasks')
+    return _executor
+
+
+# Fork edilen worker parent'in thread pool'unu (thread'leri kopyalanmaz) kullanmasin.
+def _reset_executor():
+    global _executor
+    _executor = None
+
+
+os.register_at_fork(after_in_child=_reset_executor)
+
+
+def _run_in_worker(func, args):
+    close_old_connections()
+    try:
+        func(*args)
+    except Exception:  # Future'in sonucunu bekleyen yok; hata kaybolmasin.
+        logger.exception('Background task %s failed', func.__qualname__)
+    finally:
+        connections.close_all()  # Thread'in DB baglantilari.
+
+
+# func(*args)'i arka plan thread'ine verir (API_TASK_WORKERS = 0 ise hemen calistirir).
+def submit(func, *args):
+    if settings.API_TASK_WORKERS > 0:
+        executor().submit(_run_in_worker, func, args)
+    else:
+        func(*args)
+
+
+# func(*args)'i commit'ten sonra arka planda calistirir (transaction disindaysa hemen kuyruga ekler).
+def run_after_commit(func, *args):
+    transaction.on_commit(lambda: submit(func, *args))
@@ -1,6 +1,6 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter  # ViewSet'ler icin otomatik CRUD URL'leri uretir.
-from . import views
+from . import async_views, views
 
 # api/urls.py: app-level endpoint tanimlari.
 # Neden: view'leri URL pattern'leri ile eslemek.
@@ -8,7 +8,16 @@ from . import views
 urlpatterns = [
     path('products/', views.ProductListCreateAPIView.as_view()),  # /products/ -> list + create
     path('products/info', views.ProductInfoAPIView.as_view()),  # /products/info -> ozet bilgi
+    path('products/batch', views.ProductBatchAPIView.as_view()),  # /products/batch?ids=1,2,3 -> cok sayida product tek sorguda
     path('products/<int:product_id>/', views.ProductDetailAPIView.as_view()),  # /products/1/ -> retrieve/update/delete
+    path('analytics/sales', views.SalesAnalyticsAPIView.as_view()),  # /analytics/sales -> gunluk satis rollup'lari (admin)
+
+    # ASGI-native (async) okuma endpoint'leri; ayni filtre ve serializer'lar.
+    path('async/products/', async_views.AsyncProductListView.as_view()),
+    path('async/products/info', async_views.AsyncProductInfoView.as_view()),
+    path('async/products/<int:product_id>/', async_views.AsyncProductDetailView.as_view()),
+    path('async/orders/', async_views.AsyncOrderListView.as_view()),
+    path('async/orders/<uuid:order_id>/', async_views.AsyncOrderDetailView.as_view()),
 ]
 
 router = DefaultRouter()  # ViewSet icin otomatik route olusturur (list, create, retrieve, update, destroy).
@@ -1,19 +1,32 @@
-from django.db.models import Max
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Max, Prefetch, Sum, Value
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.decorators import action
-from rest_framework import filters, generics, viewsets
+from rest_framework import filters, generics, status, viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import api_view
 from rest_framework.pagination import (LimitOffsetPagination,
                                        PageNumberPagination)
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from api.filters import InStockFilterBackend, OrderFilter, ProductFilter
-from api.models import Order, OrderItem, Product
-from api.serializers import (OrderSerializer, ProductInfoSerializer,
-                             ProductSerializer)
+from api.cache import CachedResponseMixin
+from api.conditional import ConditionalGetMixin, last_modified_of
+from api.filters import InStockFilterBackend, OrderFilter, ProductFilter, SalesFilter
+from api.models import DailyProductSales, DailySales, Order, OrderItem, Product
+from api.pagination import KeysetPagination, ProductInfoPagination
+from api.renderers import NDJSONRenderer
+from api.search import FullTextSearchFilter
+from api.serializers import (BulkOrderCreateSerializer, DailySalesSerializer,
+                             OrderSerializer, ProductBatchSerializer, ProductInfoSerializer,
+                             ProductSalesSerializer, ProductSerializer,
+                             SalesSerializer, ValuesListSerializer)
 
 # views.py: API endpoint davranislarini topladigimiz katman.
 # Neden: HTTP istegini queryset + serializer + permission ile birlestirip response uretiriz.
@@ -47,14 +60,16 @@ class ProductCreateAPIView(generics.CreateAPIView):
 # 1.3.
 # Product listesi + yeni product olusturma endpoint'i (GET/POST).
 # Neden: listeleme ve create icin ayri endpoint yazmadan DRF generic kullanmak.
-class ProductListCreateAPIView(generics.ListCreateAPIView):
+class ProductListCreateAPIView(CachedResponseMixin, generics.ListCreateAPIView):
+    replica_reads = True  # GET'ler read replica'dan okunur (api/db_router.py).
+    cache_models = (Product,)  # GET response'lari Product versiyonuna gore cache'lenir.
     queryset = Product.objects.order_by('pk')  # Base QuerySet; pagination stabil olsun diye pk ile siralar.
     serializer_class = ProductSerializer  # Response ve POST/PUT body formatini belirler.
     #filterset_fields = ('name', 'price') # Filtering (products/?name=Television)
     #filterset_fields yerine class kullanabiliiriz (filters.py)
     filterset_class = ProductFilter  # django-filter ile alan bazli filtreleri buradan alir.
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter, InStockFilterBackend]  # Query param ile filtre/arama/siralama + custom stok filtresi.
-    search_fields = ['=name', 'description']  # SearchFilter bunlari kullanir; '=name' exact match, description partial.
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter, InStockFilterBackend]  # Query param ile filtre/arama/siralama + custom stok filtresi.
+    search_fields = ['=name', 'description']  # FTS desteklenmeyen DB'de SearchFilter bunlari kullanir; '=name' exact match, description partial.
     ordering_fields = ['name', 'price', 'stock']  # OrderingFilter icin whitelist; ?ordering=price gibi.
     pagination_class = LimitOffsetPagination  # ?limit=..&offset=.. seklinde pagination kullan.
     #pagination_class.page_size = 2 #override settings.py
@@ -62,6 +77,36 @@ class ProductListCreateAPIView(generics.ListCreateAPIView):
     #pagination_class.page_size_query_param = 'size' #costumization over how many produts we get per page
     #pagination_class.max_page_size = 6 #limit the products per page
     LimitOffsetPagination  # Tek basina yazilinca etkisi yok; sadece not olarak kalmis.
+    keyset_pagination_class = KeysetPagination  # ?pagination=cursor veya ?cursor=.. ile keyset moduna gecer.
+
+    # ?pagination=cursor (ilk sayfa) veya ?cursor=.. (sonraki sayfalar) varsa keyset, yoksa limit/offset.
+    # Neden: derin sayfalarda OFFSET taramasi ve her sayfadaki COUNT(*) maliyetinden kacmak.
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = getattr(self.request, 'query_params', {})
+            if params.get('pagination') == 'cursor' or self.keyset_pagination_class.cursor_query_param in params:
+                self._paginator = self.keyset_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    values_serializer = ValuesListSerializer(ProductSerializer)  # GET listesi icin model instance'siz hizli yol.
+
+    # GET listesi: satirlar values_list ile (model instance olusturmadan) cekilir ve ProductSerializer
+    # ile ayni JSON'a cevrilir. ?shape=columns ile {"columns": [...], "rows": [[...]]} doner.
+    # pk son kolon olarak eklenir; keyset cursor'i (row.pk) icin gerekli, response'a yazilmaz.
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*self.values_serializer.sources, 'pk', named=True)
+        page = self.paginate_queryset(queryset)
+        rows = queryset if page is None else page
+        if request.query_params.get('shape') == 'columns':
+            data = self.values_serializer.to_columns(rows)
+        else:
+            data = self.values_serializer.to_representation(rows)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
 
     # GET herkese acik, POST icin admin kontrolu uygular.
     def get_permissions(self):
@@ -94,11 +139,18 @@ class ProductDetailAPIView(generics.RetrieveAPIView):
 # 2.3.
 # Tek product kaydini getirir; PUT/PATCH/DELETE ile guncelleme/silme yapar.
 # Neden: read + update + delete tek endpoint'te toplanir.
-class ProductDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+class ProductDetailAPIView(CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
+    replica_reads = True  # GET'ler read replica'dan okunur (api/db_router.py).
+    cache_models = (Product,)  # GET response'lari Product versiyonuna gore cache'lenir.
     queryset = Product.objects.all()  # Detail view icin gerekli base QuerySet.
     serializer_class = ProductSerializer  # Hem read hem write icin serializer.
     lookup_url_kwarg = 'product_id'  # URL param adini 'product_id' olarak map eder.
 
+    # Last-Modified: tek kaydin updated_at degeri (sadece bu kolon okunur); silinen kayit 404 doner.
+    # Listeler (ve batch) CachedResponseMixin'in varsayilanini kullanir: Product'in son yazim zamani.
+    def get_last_modified(self, request, *args, **kwargs):
+        return last_modified_of(self.get_queryset().filter(pk=kwargs[self.lookup_url_kwarg]))
+
     # PUT/PATCH/DELETE sadece admin, GET herkese acik.
     def get_permissions(self):
         self.permission_classes = [AllowAny]  # GET icin serbest.
@@ -106,6 +158,43 @@ class ProductDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
             self.permission_classes = [IsAdminUser]  # Yazma/silme icin admin yetkisi.
         return super().get_permissions()
 
+
+# 2.4.
+# /products/batch: cok sayida product'i tek istekte ve tek sorguda (in_bulk) getirir.
+# Neden: sepet / oneri listesi icin urun basina /products/<id>/ cagrisi N HTTP istegi + N sorgu demek.
+# GET ?ids=3,1,2 (response cache'inden gelebilir) veya uzun listeler icin POST {"ids": [3, 1, 2]} (cache'lenmez).
+# Sonuclar istekteki sirayla doner (tekrarlanan id'ler bir kez); bulunamayan id'ler "missing" listesinde.
+class ProductBatchAPIView(CachedResponseMixin, APIView):
+    replica_reads = True  # GET'ler read replica'dan okunur (api/db_router.py).
+    cache_models = (Product,)  # GET response'lari Product versiyonuna gore cache'lenir.
+    permission_classes = [AllowAny]  # POST sadece okuma yapar; detail GET'i gibi herkese acik.
+
+    def get(self, request):
+        return self.cached_get(request, self.batch)
+
+    def post(self, request):
+        return self.batch(request)
+
+    # GET'te virgulle ayrilmis ?ids=, POST'ta body'deki ids listesi; tekrarlar ilk gorulen sirada atilir.
+    def get_ids(self, request):
+        if request.method == 'POST':
+            data = request.data
+        else:
+            data = {'ids': [pk for pk in request.query_params.get('ids', '').split(',') if pk.strip()]}
+        serializer = ProductBatchSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        return list(dict.fromkeys(serializer.validated_data['ids']))
+
+    def batch(self, request):
+        ids = self.get_ids(request)
+        products = Product.objects.in_bulk(ids)  # Tek sorgu: WHERE id IN (...).
+        found = [products[pk] for pk in ids if pk in products]
+        data = ProductSerializer(found, many=True).data
+        return Response({
+            'results': [{'id': product.pk, **item} for product, item in zip(found, data)],  # ProductSerializer id icermez.
+            'missing': [pk for pk in ids if pk not in products],
+        })
+
 ##########################################################################
 
 # 3.1.
@@ -139,25 +228,81 @@ class UserOrderListAPIView(generics.ListAPIView):
         return qs.filter(user=user)  # Yalnizca bu user'in siparisleri.
 """
 
+# Satir tutari (quantity * product.price) DB'de hesaplanir.
+# Neden: her satir icin Python'da Decimal carpimi yapmamak.
+def item_subtotal_expression():
+    return ExpressionWrapper(
+        F('quantity') * F('product__price'),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+# Order QuerySet'ine item/product prefetch'ini ve DB'de hesaplanan satir tutarlarini ekler.
+# Neden: sync (OrderViewSet) ve async (async_views.py) order endpoint'leri ayni sorguyu kullansin.
+# Order toplami Order.total_price kolonundan gelir (OrderItem yazimlarinda guncellenir).
+def with_order_items(queryset):
+    return queryset.prefetch_related(
+        Prefetch('items', queryset=OrderItem.objects.select_related('product').annotate(subtotal=item_subtotal_expression())),  # Item + product tek JOIN sorgusunda; subtotal DB'den gelir.
+    )  # Nested serializer icin prefetch; sorgu sayisini azaltir.
+
+
 # 3.3.
 # Order icin tam CRUD saglayan ViewSet.
 # Neden: router ile otomatik list/create/retrieve/update/delete endpoint'leri olusur.
-class OrderViewSet(viewsets.ModelViewSet):
-    queryset = Order.objects.prefetch_related('items__product')  # Nested serializer icin prefetch; sorgu sayisini azaltir.
+class OrderViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    replica_reads = True  # GET'ler read replica'dan okunur (api/db_router.py).
+    queryset = Order.objects.all()  # Base QuerySet; totals/prefetch get_queryset'te eklenir.
     serializer_class = OrderSerializer  # Order + items formatini belirler.
     permission_classes = [IsAuthenticated]  # Tumu icin login zorunlu; guest erisimi kapatir.
     pagination_class = None  # ViewSet'te pagination istemiyorsan None (tum listeyi tek response).
     filterset_class = OrderFilter  # /orders/?status=Pending gibi filtreleri aktif eder.
-    filter_backends = [DjangoFilterBackend]  # filterset_class'in calismasi icin backend gerekir.
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]  # filterset_class'in calismasi icin backend gerekir; ?ordering=-total_price.
+    ordering_fields = ['total_price', 'created_at']  # OrderingFilter whitelist'i; total_price index'li.
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]  # Accept: application/x-ndjson icin stream modu.
+    stream_chunk_size = 500  # Stream modunda DB'den tek seferde cekilen order sayisi.
 
     # Staff ise tum order'lari gor, degilse sadece kendi order'larini goster.
     # Neden: normal user baska kullanicinin verisini gormesin.
-    def get_queryset(self):
+    def get_conditional_queryset(self):
         qs = super().get_queryset()  # ViewSet'in base queryset'ini al.
         if not self.request.user.is_staff:
             qs = qs.filter(user=self.request.user)  # Normal user icin sadece kendi order'lari.
         return qs  # Staff ise filtre uygulanmadan doner.
 
+    # Serializer icin: gorunur order'lar + DB'de hesaplanan toplamlar + item/product prefetch.
+    # Neden: conditional GET (304) karari bu agir sorguya girmeden get_conditional_queryset ile verilir.
+    def get_queryset(self):
+        return with_order_items(self.get_conditional_queryset())
+
+    # POST /orders/bulk/: tek istekte cok sayida order + item olusturur, stoklari tek transaction'da dusurur.
+    # Neden: checkout batch job'u her order icin ayri HTTP istegi atmasin.
+    @action(detail=False, methods=['post'], url_path='bulk', serializer_class=BulkOrderCreateSerializer)
+    def bulk(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        orders = serializer.save()
+        queryset = self.get_queryset().filter(pk__in=[order.pk for order in orders]).order_by('created_at', 'pk')
+        return Response(OrderSerializer(queryset, many=True, context=self.get_serializer_context()).data, status=status.HTTP_201_CREATED)
+
+    # ?stream=1 veya Accept: application/x-ndjson ise liste stream edilir, degilse normal JSON liste doner.
+    # Neden: pagination olmadigi icin butun order'lari RAM'de serialize etmemek.
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('stream') in ('1', 'true') or request.accepted_renderer.format == 'ndjson':
+            return self.stream_list(request)
+        return super().list(request, *args, **kwargs)
+
+    # Order'lari chunk chunk ceker (her chunk icin items prefetch calisir), tek tek serialize edip satir satir yazar.
+    def stream_list(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()  # Tek serializer instance'i her order icin tekrar kullanilir.
+        renderer = NDJSONRenderer()
+
+        def rows():
+            for order in queryset.iterator(chunk_size=self.stream_chunk_size):
+                yield renderer.render_row(serializer.to_representation(order))
+
+        return StreamingHttpResponse(rows(), content_type=renderer.media_type)
+
 ##########################################################################
 
 # 4.1.
@@ -177,13 +322,102 @@ def product_info(request):
 # 4.2.
 # Custom response icin APIView kullaniyoruz (standart generics degil).
 # Neden: list + aggregate (count, max_price) ayni response'ta donsun.
-class ProductInfoAPIView(APIView):
-    # GET: product listesi + count + max_price doner.
+class ProductInfoAPIView(CachedResponseMixin, APIView):
+    replica_reads = True  # GET'ler read replica'dan okunur (api/db_router.py).
+    cache_models = (Product,)  # GET response'lari Product versiyonuna gore cache'lenir.
+    pagination_class = ProductInfoPagination  # ?limit=..&offset=.. ile products listesi sayfalanir.
+
+    # GET: response cache'i (CachedResponseMixin) uzerinden info() cagrilir.
     def get(self, request):
-        products = Product.objects.all()  # QuerySet.
+        return self.cached_get(request, self.info)
+
+    # Product listesi (sayfali) + count + max_price doner.
+    # Neden: len(products) tum katalogu RAM'e cekiyordu; count ve max_price tek aggregate sorgusunda gelir.
+    def info(self, request):
+        products = Product.objects.order_by('pk')  # Sayfalar stabil olsun diye pk ile sirali QuerySet.
+        info = products.aggregate(count=Count('pk'), max_price=Max('price'))  # Tek sorgu: COUNT + MAX.
+
+        paginator = self.pagination_class()
+        paginator.request = request
+        paginator.count = info['count']  # Ayrica COUNT(*) calismasin diye aggregate sonucunu kullanir.
+        paginator.limit = paginator.get_limit(request)
+        paginator.offset = paginator.get_offset(request)
+
         serializer = ProductInfoSerializer({
-            'products': products,
-            'count': len(products),
-            'max_price': products.aggregate(max_price=Max('price'))['max_price']
+            'products': products[paginator.offset:paginator.offset + paginator.limit],  # Sadece istenen sayfa DB'den gelir.
+            'count': info['count'],
+            'max_price': info['max_price'],
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
             })  # Dict -> serializer ile tek response.
         return Response(serializer.data)
+
+##########################################################################
+
+# 5.1.
+# Rollup toplamlari: gruplanmis revenue/units/orders icin annotate() ve aggregate() ifadeleri.
+def sales_sums():
+    return {
+        'revenue': Coalesce(Sum('revenue'), Value(Decimal('0.00')), output_field=DecimalField(max_digits=14, decimal_places=2)),
+        'units': Coalesce(Sum('units'), Value(0)),
+        'orders': Coalesce(Sum('orders'), Value(0)),
+    }
+
+
+# /analytics/sales: gun veya urun bazinda ciro, adet ve order sayisi (sadece admin).
+# Neden: raporlar icin /orders/ cekip istemcide toplamak yerine gunluk rollup tablolari okunur;
+# istek aninda Order/OrderItem taranmaz, bir yillik aralik ~365 x status satiri demektir.
+# Parametreler: ?group=day|product, ?status=, ?created_at=, ?created_at__gt=, ?created_at__lt=,
+#               ?product=<id> (tek urunun gunluk satislari), ?limit= (group=product icin, varsayilan 100).
+class SalesAnalyticsAPIView(CachedResponseMixin, APIView):
+    cache_models = (DailySales,)  # Rollup'lar her yenilendiginde versiyon artar (refresh_sales_rollups).
+    permission_classes = [IsAdminUser]
+    filterset_class = SalesFilter
+    default_limit = 100
+    max_limit = 1000
+
+    def get(self, request):
+        return self.cached_get(request, self.sales)
+
+    def filter_queryset(self, request, queryset):
+        filterset = self.filterset_class(request.query_params, queryset=queryset, request=request)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        return filterset.qs
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            raise ValidationError({'limit': 'A valid integer is required.'})
+        return max(1, min(limit, self.max_limit))
+
+    def sales(self, request):
+        group = request.query_params.get('group', 'day')
+        if group not in ('day', 'product'):
+            raise ValidationError({'group': 'Must be "day" or "product".'})
+
+        # Urun filtresi yoksa gunluk toplamlar DailySales'ten gelir (order sayisi urun basina tekrar sayilmaz).
+        if 'product' in request.query_params:
+            daily = self.filter_queryset(request, DailyProductSales.objects.all())
+        else:
+            daily = self.filter_queryset(request, DailySales.objects.all())
+        totals = daily.aggregate(**sales_sums())
+
+        if group == 'day':
+            rows = daily.values('day').annotate(**sales_sums()).order_by('day')
+            results = DailySalesSerializer(rows, many=True).data
+        else:
+            rows = (
+                self.filter_queryset(request, DailyProductSales.objects.all())
+                .values('product', product_name=F('product__name'))
+                .annotate(**sales_sums())
+                .order_by('-revenue', 'product')[:self.get_limit(request)]
+            )
+            results = ProductSalesSerializer(rows, many=True).data
+
+        return Response({
+            'group': group,
+            'totals': SalesSerializer(totals).data,
+            'results': results,
+        })
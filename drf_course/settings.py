@@ -1,5 +1,9 @@
+import os
 from pathlib import Path
 
+from api.profiling import should_profile_request
+from drf_course.database import database_config, replica_configs, sqlite_options
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent  # Proje kok dizini.
 
@@ -30,14 +34,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',  # Route bazli latency/SQL metrikleri (/metrics); en basta: diger middleware'ler dahil
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'api.db_router.ReplicaRoutingMiddleware',  # GET okumalarini replica'ya yonlendirir (sticky reads)
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'silk.middleware.SilkyMiddleware',  # Silk icin middleware
+    'api.profiling.ProfilingMiddleware',  # Silk (SilkyMiddleware); SILK_PROFILING['ASYNC_PATHS'] disinda
 ]
 
 ROOT_URLCONF = 'drf_course.urls'  # Proje seviyesinde URL dosyasi.
@@ -64,12 +70,28 @@ WSGI_APPLICATION = 'drf_course.wsgi.application'  # WSGI entrypoint.
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',  # Lokal gelistirme icin sqlite.
+# DATABASE_URL verilirse prod profili (PostgreSQL, kalici baglanti veya pool, read replica'lar);
+# environment degiskenleri drf_course/database.py'de. Verilmezse lokal SQLite (eszamanli yazim icin ayarli).
+if os.environ.get('DATABASE_URL'):
+    DATABASES = {
+        'default': database_config(os.environ['DATABASE_URL']),
+        **replica_configs(os.environ.get('DATABASE_REPLICA_URLS', '')),
     }
-}
+    DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',  # Lokal gelistirme / kucuk edge kurulumlari icin sqlite.
+            'OPTIONS': sqlite_options(),  # DB_SQLITE_TUNING=1 ise WAL, PRAGMA'lar, BEGIN IMMEDIATE, busy timeout (drf_course/database.py).
+        },
+    }
+    # Lokal replica stand-in'i: ayni SQLite dosyasi, testlerde primary'nin mirror'i.
+    # DATABASE_REPLICAS bos oldugu icin router kullanmaz; testler override_settings ile acar.
+    DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ['api.db_router.PrimaryReplicaRouter']
+DATABASE_STICKY_SECONDS = int(os.environ.get('DATABASE_STICKY_SECONDS', 5))  # Yazmadan sonra primary'den okuma suresi.
 
 
 # Password validation
@@ -105,6 +127,17 @@ USE_TZ = True  # Timezone-aware datetime kullan.
 
 STATIC_URL = 'static/'  # Static dosyalarin URL prefix'i.
 
+MEDIA_URL = 'media/'  # Upload edilen dosyalarin (Product.image ve rendition'lari) URL prefix'i.
+MEDIA_ROOT = BASE_DIR / 'media'  # Upload'larin diskteki yeri; DEBUG'da Django servis eder, prod'da web sunucusu.
+
+# Product gorsel rendition'lari (api/images.py).
+PRODUCT_IMAGES = {
+    'WIDTHS': (160, 480, 1024),  # Uretilen genislikler (px); orijinalden buyukleri uretilmez.
+    'FORMAT': 'WEBP',  # Pillow'da WebP yoksa JPEG.
+    'QUALITY': 80,
+    'WORKERS': int(os.environ.get('PRODUCT_IMAGE_WORKERS', 2)),  # process_product_images thread'leri; upload sonrasi is API_TASK_WORKERS'ta.
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.0/ref/settings/#default-auto-field
 
@@ -113,15 +146,74 @@ AUTH_USER_MODEL = 'api.User'  # Custom User modelini kullan.
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',  # JWT auth
+        'api.authentication.CachedJWTAuthentication',  # JWT auth; User satiri process ici cache'ten gelir
         'rest_framework.authentication.SessionAuthentication',  # Browser session auth
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer',  # JSONRenderer ile ayni cikti; orjson yoksa JSONRenderer'a duser
+        'rest_framework.renderers.BrowsableAPIRenderer',  # Tarayicida gezilebilir API
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.ORJSONParser',  # JSONParser ile ayni sonuc; orjson ile parse eder
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',  # drf-spectacular schema uretimi
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],  # Query param filtreleme
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',  # Default pagination
     'PAGE_SIZE': 2  # Sayfa basina default kayit sayisi
 }
 
+# Silk: istekler secerek kaydedilir (api/profiling.py); /silk/ arayuzu prod'da da acik kalabilir.
+# SAMPLE_RATE: rastgele kaydedilen istek orani (0.0-1.0); DEBUG kapaliyken %1.
+# Staff kullanicilar "X-Silk-Profile: 1" header'i ile tek bir istegi her zaman kaydettirebilir.
+SILK_PROFILING = {
+    'SAMPLE_RATE': 1.0 if DEBUG else 0.01,
+    'INCLUDE_PATHS': [],  # Orn. ['/orders/']; bos ise tum endpoint'ler orneklenir.
+    'EXCLUDE_PATHS': ['/silk/', '/static/', '/media/', '/admin/jsi18n/'],
+    'STAFF_HEADER': 'X-Silk-Profile',
+    'ASYNC_PATHS': ['/async/'],  # Async view'ler Silk'siz (sync-only) calisir: ASGI'de thread'e gecmesinler.
+}
+SILKY_INTERCEPT_FUNC = should_profile_request
+SILKY_MIDDLEWARE_CLASS = 'api.profiling.ProfilingMiddleware'  # silk.profiling decorator'larinin kurulum kontrolu.
+SILKY_MAX_RECORDED_REQUESTS = 10000  # Saklanan en fazla istek; eskiler silinir.
+SILKY_MAX_RECORDED_REQUESTS_CHECK_PERCENT = 10  # Temizlik kontrolu isteklerin %10'unda calisir.
+SILKY_MAX_REQUEST_BODY_SIZE = 64 * 1024  # Bundan buyuk request/response body'leri kaydedilmez (byte).
+SILKY_MAX_RESPONSE_BODY_SIZE = 64 * 1024
+
+# /metrics (api/metrics.py): DIR verilirse her worker process metriklerini bu dizine yazar ve
+# /metrics hepsini toplar (gunicorn/uvicorn coklu worker). Verilmezse sadece cevap veren process'in metrikleri.
+# DIR host (container) basina ayri olmali; calismayan pid'lerin dosyalari otomatik silinir.
+# /metrics'i staff kullanicilar ve "Authorization: Bearer $API_METRICS_TOKEN" gonderen scraper okuyabilir.
+API_METRICS = {
+    'DIR': os.environ.get('API_METRICS_DIR'),
+    'TOKEN': os.environ.get('API_METRICS_TOKEN'),  # Bos ise sadece staff session'i.
+    'FLUSH_INTERVAL': 1.0,  # Saniye; process durum dosyasinin en sik yazilma araligi.
+    'EXCLUDE_PATHS': ['/metrics', '/silk/', '/static/'],
+}
+
+# Cache: varsayilan olarak process ici local-memory (LRU; MAX_ENTRIES dolunca en az kullanilanlar silinir).
+# Birden fazla worker'da versiyon sayaclari paylasilsin diye prod'da Redis/Memcached backend'i verilmeli.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'drf-course',
+        'TIMEOUT': 300,  # Saniye; versiyon degismese de response en fazla bu kadar tutulur.
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,  # LRU boyut siniri.
+            'CULL_FREQUENCY': 10,  # Dolunca en eski 1/10'u siler.
+        },
+    }
+}
+API_RESPONSE_CACHE_ALIAS = 'default'  # Product response cache'inin kullandigi alias (api/cache.py).
+API_USER_CACHE_SIZE = 10000  # CachedJWTAuthentication'in process basina tuttugu en fazla user sayisi.
+# Saniye; cache hit'te is_active/revoke kontrolu yapilmaz. QuerySet.update() ile deaktif edilen user ve diger
+# worker'lardaki degisiklikler en gec bu surede gorulur. SIMPLE_JWT['CHECK_REVOKE_TOKEN'] aciksa cache kullanilmaz.
+API_USER_CACHE_TTL = 60
+API_TASK_WORKERS = int(os.environ.get('API_TASK_WORKERS', 2))  # Commit sonrasi arka plan isleri icin thread (api/tasks.py); 0 ise senkron.
+
+API_SCHEMA_FILE = BASE_DIR / 'schema.yml'  # /api/schema/ bu dosyadan servis edilir; manage.py build_schema ile uretilir.
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Your Project API',
     'DESCRIPTION': 'Your project description',
@@ -1,10 +1,15 @@
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+
+from api.metrics import metrics_view
+from api.schema import schema_view
 
 # drf_course/urls.py: proje seviyesindeki URL konfigurasyonu.
 # Neden: app URL'lerini ve global endpoint'leri tek merkezde toplamak.
@@ -13,11 +18,13 @@ urlpatterns = [
     path('admin/', admin.site.urls),  # Django admin paneli
     path('', include('api.urls')),  # api app URL'leri
     path('silk/', include('silk.urls', namespace='silk')),  # Silk profiling arayuzu
+    path('metrics', metrics_view, name='metrics'),  # Prometheus text formatinda endpoint metrikleri
 
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),  # JWT access+refresh token
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),  # JWT refresh token
 
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),  # OpenAPI schema (makine-okur)
+    path('api/schema/', schema_view, name='schema'),  # OpenAPI schema (makine-okur); build_schema ile on-uretilir, bellekten servis edilir
     path('api/schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),  # Swagger UI
     path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),  # Redoc UI
 ]
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)  # Sadece DEBUG'da; /media/ upload'lari ve rendition'lar